@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+'''Compare bytes on the wire and wall time of the largest public payloads
+with and without compressed responses.
+
+usage: python benchmarks/compression.py [repeat]
+'''
+
+import sys
+import time
+import statistics
+from cryptotik.common import HTTPTransport, headers
+from cryptotik import Poloniex, Binance, Kraken, Bittrex, Bitstamp, Hitbtc, TheRock
+from cryptotik.bitmex import Bitmex
+
+payloads = [
+    ('poloniex', 'returnOrderBook', Poloniex.url + 'public',
+     {'command': 'returnOrderBook', 'currencyPair': 'BTC_ETH', 'depth': 999999}),
+    ('poloniex', 'returnTicker', Poloniex.url + 'public', {'command': 'returnTicker'}),
+    ('binance', 'exchangeInfo', Binance.url + 'api/v1/exchangeInfo', {}),
+    ('binance', 'ticker/24hr', Binance.url + 'api/v1/ticker/24hr', {}),
+    ('kraken', 'AssetPairs', Kraken.url + 'public/AssetPairs', {}),
+    ('kraken', 'Depth', Kraken.url + 'public/Depth', {'pair': 'XBTEUR', 'count': 1000}),
+    ('bittrex', 'getmarketsummaries', Bittrex.url + 'public/getmarketsummaries', {}),
+    ('bitstamp', 'order_book', Bitstamp.api_url + 'v2/order_book/btcusd', {}),
+    ('hitbtc', 'ticker', Hitbtc.url + 'public/ticker', {}),
+    ('therock', 'funds', TheRock.url + 'funds', {}),
+    ('bitmex', 'instrument/active', Bitmex.url + '/instrument/active', {}),
+]
+
+
+def measure(transport, url, params):
+    '''return (bytes on the wire, decoded bytes, seconds)'''
+
+    start = time.perf_counter()
+    response = transport.get(url, params=params, headers=headers,
+                             timeout=(8, 30), stream=True)
+    body = response.raw.read(decode_content=True)
+    elapsed = time.perf_counter() - start
+
+    return response.raw.tell(), len(body), elapsed
+
+
+def main(repeat=3):
+
+    transports = {'identity': HTTPTransport(),
+                  'compressed': HTTPTransport(compression=True)}
+
+    print('{:<10}{:<20}{:<12}{:>12}{:>12}{:>10}'.format(
+          'exchange', 'endpoint', 'mode', 'wire', 'body', 'ms'))
+
+    for exchange, endpoint, url, params in payloads:
+        for mode, transport in transports.items():
+            try:
+                runs = [measure(transport, url, params) for _ in range(repeat)]
+            except Exception as e:
+                print('{:<10}{:<20}{:<12}{}'.format(exchange, endpoint, mode, e))
+                continue
+
+            print('{:<10}{:<20}{:<12}{:>12}{:>12}{:>10.1f}'.format(
+                  exchange, endpoint, mode,
+                  runs[-1][0], runs[-1][1],
+                  statistics.median(i[2] for i in runs) * 1000))
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
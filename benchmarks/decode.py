@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+'''Compare the old response pipeline, which called response.json() three times
+(twice in _verify_response and once more to return the result),
+with a single decode by the fastest installed decoder.
+
+usage: python benchmarks/decode.py [recorded_payload.json ...]
+
+Without arguments synthetic Poloniex and Kraken order books are used.
+'''
+
+import sys
+import json
+import random
+import timeit
+import requests
+from cryptotik.common import decode, json_loads
+
+
+def order_book(levels):
+    '''Poloniex shaped returnOrderBook payload'''
+
+    price = 0.03
+    return {'asks': [['{:.8f}'.format(price + i * 1e-6), random.random() * 10]
+                     for i in range(levels)],
+            'bids': [['{:.8f}'.format(price - i * 1e-6), random.random() * 10]
+                     for i in range(levels)],
+            'isFrozen': '0', 'seq': 1}
+
+
+def kraken_book(levels):
+    '''Kraken shaped public/Depth payload'''
+
+    book = order_book(levels)
+    return {'error': [],
+            'result': {'XXBTZEUR': {side: [[p, str(q), 1530000000] for p, q in book[side]]
+                                    for side in ('asks', 'bids')}}}
+
+
+def response(body):
+
+    r = requests.Response()
+    r._content = body
+    r.encoding = 'utf-8'
+    return r
+
+
+def triple(r):
+
+    if 'error' in r.json() and r.json()['error']:
+        raise ValueError
+    return r.json()
+
+
+def single(r):
+
+    data = decode(r)
+    if 'error' in data and data['error']:
+        raise ValueError
+    return data
+
+
+def main(paths):
+
+    if paths:
+        payloads = [(p, open(p, 'rb').read()) for p in paths]
+    else:
+        payloads = [('poloniex 50000 levels', json.dumps(order_book(50000)).encode()),
+                    ('kraken 1000 levels', json.dumps(kraken_book(1000)).encode())]
+
+    print('decoder: {}.{}'.format(json_loads.__module__, json_loads.__name__))
+    print('{:<28}{:>10}{:>14}{:>14}{:>10}'.format('payload', 'KiB', '3x json ms',
+                                                  '1x fast ms', 'speedup'))
+
+    for name, body in payloads:
+        r = response(body)
+        number = 20
+        old = timeit.timeit(lambda: triple(r), number=number) / number
+        new = timeit.timeit(lambda: single(r), number=number) / number
+
+        print('{:<28}{:>10.0f}{:>14.2f}{:>14.2f}{:>9.1f}x'.format(
+              name, len(body) / 1024, old * 1000, new * 1000, old / new))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+'''Measure how long a fresh interpreter takes to import cryptotik and get one exchange class,
+compared to importing every exchange module up front like the package used to.
+
+usage: python benchmarks/import_time.py [runs]
+'''
+
+import sys
+import subprocess
+import statistics
+
+cases = [('python startup', 'pass'),
+         ('import cryptotik', 'import cryptotik'),
+         ('cryptotik.Binance', 'import cryptotik; cryptotik.Binance'),
+         ('every exchange (eager)', 'import cryptotik; [getattr(cryptotik, i) for i in cryptotik.__all__]')]
+
+timer = '''import time; start = time.perf_counter()
+{}
+print(time.perf_counter() - start)'''
+
+
+def measure(code, runs):
+
+    times = [float(subprocess.check_output([sys.executable, '-c', timer.format(code)]))
+             for _ in range(runs)]
+    return statistics.median(times)
+
+
+def main(runs):
+
+    print('{:<28}{:>12}'.format('case', 'median ms'))
+
+    for name, code in cases:
+        print('{:<28}{:>12.1f}'.format(name, measure(code, runs) * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
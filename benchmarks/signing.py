@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+'''Signatures per second of each exchange's _generate_signature,
+compared with keying a new HMAC for every message as the wrappers used to.
+
+usage: python benchmarks/signing.py [seconds per case]
+'''
+
+import sys
+import time
+import hmac
+import base64
+import hashlib
+from cryptotik import Poloniex, Bittrex, Binance, TheRock, Kraken, Bitstamp
+from cryptotik.bitmex import Bitmex
+
+secret = 'Zm9vYmFyYmF6cXV4' * 4  # valid base64, kraken secrets are
+body = b'command=returnBalances&nonce=1530000000000000000'
+url = 'https://bittrex.com/api/v1.1/account/getbalances?apikey=key&nonce=1530000000'
+
+cases = [
+    ('poloniex', lambda e: e._generate_signature(body),
+     lambda: hmac.new(secret.encode(), body, hashlib.sha512).hexdigest(), Poloniex),
+    ('bittrex', lambda e: e._generate_signature(url),
+     lambda: hmac.new(secret.encode(), url.encode(), hashlib.sha512).hexdigest(), Bittrex),
+    ('binance', lambda e: e._generate_signature(body),
+     lambda: hmac.new(secret.encode(), body, hashlib.sha256).hexdigest(), Binance),
+    ('therock', lambda e: e._generate_signature(url),
+     lambda: hmac.new(secret.encode(), url.encode(), hashlib.sha512).hexdigest(), TheRock),
+    ('kraken', lambda e: e._generate_signature(body),
+     lambda: base64.b64encode(hmac.new(base64.b64decode(secret.encode()), body,
+                                       hashlib.sha512).digest()).decode(), Kraken),
+    ('bitstamp', lambda e: e._generate_signature(url),
+     lambda: hmac.new(secret.encode(), url.encode(), hashlib.sha256).hexdigest().upper(), Bitstamp),
+    ('bitmex', lambda e: e._generate_signature(url, {}, 1530000000, 'GET'),
+     None, Bitmex),
+]
+
+
+def rate(fn, seconds):
+    '''calls of <fn> per second'''
+
+    n, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(1000):
+            fn()
+        n += 1000
+    return n / (time.perf_counter() - start)
+
+
+def main(seconds):
+
+    print('{:<12}{:>16}{:>16}{:>10}'.format('exchange', 'rekeyed sig/s', 'cached sig/s', 'speedup'))
+
+    for name, sign, rekeyed, cls in cases:
+        exchange = cls('key', secret)
+        new = rate(lambda: sign(exchange), seconds)
+
+        if rekeyed is None:
+            print('{:<12}{:>16}{:>16.0f}{:>10}'.format(name, '-', new, '-'))
+            continue
+
+        assert sign(exchange) == rekeyed(), name
+        old = rate(rekeyed, seconds)
+        print('{:<12}{:>16.0f}{:>16.0f}{:>9.2f}x'.format(name, old, new, new / old))
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.5)
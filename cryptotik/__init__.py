@@ -1,10 +1,33 @@
+'''Exchange classes are imported on first access, so importing the package
+does not load the modules (and their dependencies) of every exchange.'''
 
-from cryptotik.poloniex import Poloniex, PoloniexNormalized
-from cryptotik.bittrex import Bittrex, BittrexNormalized
-from cryptotik.therock import TheRock, TheRockNormalized
-from cryptotik.hitbtc import Hitbtc, HitbtcNormalized
-from cryptotik.bitstamp import Bitstamp, BitstampNormalized
-from cryptotik.binance import Binance, BinanceNormalized
-from cryptotik.bitkonan import Bitkonan
-from cryptotik.kraken import Kraken, KrakenNormalized
-from cryptotik.coinmarketcap import CoinMarketCap
+import importlib
+
+_exchanges = {'Poloniex': 'poloniex', 'PoloniexNormalized': 'poloniex',
+              'Bittrex': 'bittrex', 'BittrexNormalized': 'bittrex',
+              'TheRock': 'therock', 'TheRockNormalized': 'therock',
+              'Hitbtc': 'hitbtc', 'HitbtcNormalized': 'hitbtc',
+              'Bitstamp': 'bitstamp', 'BitstampNormalized': 'bitstamp',
+              'Binance': 'binance', 'BinanceNormalized': 'binance',
+              'Bitkonan': 'bitkonan',
+              'Kraken': 'kraken', 'KrakenNormalized': 'kraken',
+              'CoinMarketCap': 'coinmarketcap'}
+
+__all__ = list(_exchanges)
+
+
+def __getattr__(name):
+
+    try:
+        module = _exchanges[name]
+    except KeyError:
+        raise AttributeError("module 'cryptotik' has no attribute '{}'".format(name)) from None
+
+    cls = getattr(importlib.import_module('cryptotik.' + module), name)
+    globals()[name] = cls  # later lookups do not go through __getattr__
+    return cls
+
+
+def __dir__():
+
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+'''asyncio counterparts of the exchange wrappers.
+
+Every async class exposes the same methods as its synchronous sibling,
+(AsyncPoloniex.get_market_ticker == Poloniex.get_market_ticker), but as
+coroutines which run the blocking call on a thread pool.
+This is a thread offload shim, not a native async HTTP client: every request
+in flight still occupies one thread, so concurrency is bounded by the pool size.
+Only methods are exposed, attributes and properties (some of which do I/O,
+like Poloniex.taker_fee) are read from the wrapped instance, <sync>.
+
+    polo = AsyncPoloniexNormalized(max_workers=200)
+    tickers = await asyncio.gather(*[polo.get_market_ticker(i) for i in pairs])
+'''
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from cryptotik.common import HTTPTransport
+from cryptotik.poloniex import Poloniex, PoloniexNormalized
+from cryptotik.bittrex import Bittrex, BittrexNormalized
+from cryptotik.therock import TheRock, TheRockNormalized
+from cryptotik.hitbtc import Hitbtc, HitbtcNormalized
+from cryptotik.bitstamp import Bitstamp, BitstampNormalized
+from cryptotik.binance import Binance, BinanceNormalized
+from cryptotik.bitkonan import Bitkonan
+from cryptotik.kraken import Kraken, KrakenNormalized
+from cryptotik.bitmex import Bitmex
+
+
+class AsyncExchangeWrapper:
+    '''wraps a synchronous exchange wrapper, methods become coroutines.'''
+
+    sync_class = None
+    # methods which do no I/O, there is no point in awaiting them
+    sync_methods = ('format_pair', 'get_nonce')
+
+    def __init__(self, *args, executor=None, max_workers=None, **kwargs):
+        '''accepts the same arguments as <sync_class>,
+        <executor> is used to run the blocking calls, default executor of the loop is used if None.
+        <max_workers> creates a thread pool of that size and, unless <transport> is given,
+        a transport keeping as many connections per host, so none of them are thrown away.'''
+
+        if max_workers is not None:
+            executor = executor or ThreadPoolExecutor(max_workers)
+
+            if kwargs.get('transport') is None:
+                kwargs['transport'] = HTTPTransport(pool_maxsize=max_workers)
+
+        self.sync = self.sync_class(*args, **kwargs)
+        self.executor = executor
+
+    async def _run(self, name, *args, **kwargs):
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(getattr(self.sync, name), *args, **kwargs)
+
+        return await loop.run_in_executor(self.executor, call)
+
+
+def _coroutine(name, method):
+
+    async def coroutine(self, *args, **kwargs):
+        return await self._run(name, *args, **kwargs)
+
+    coroutine.__name__ = name
+    coroutine.__doc__ = method.__doc__
+
+    return coroutine
+
+
+def _delegate(name, method):
+
+    def delegate(self, *args, **kwargs):
+        return getattr(self.sync, name)(*args, **kwargs)
+
+    delegate.__name__ = name
+    delegate.__doc__ = method.__doc__
+
+    return delegate
+
+
+def make_async(cls):
+    '''build asyncio counterpart of the exchange wrapper <cls>.'''
+
+    namespace = {'sync_class': cls,
+                 '__doc__': 'asyncio counterpart of {}.'.format(cls.__name__)}
+
+    for name, method in inspect.getmembers(cls, callable):
+        if name.startswith('_'):
+            continue
+        if name in AsyncExchangeWrapper.sync_methods:
+            namespace[name] = _delegate(name, method)
+        else:
+            namespace[name] = _coroutine(name, method)
+
+    return type('Async' + cls.__name__, (AsyncExchangeWrapper,), namespace)
+
+
+AsyncPoloniex = make_async(Poloniex)
+AsyncPoloniexNormalized = make_async(PoloniexNormalized)
+AsyncBittrex = make_async(Bittrex)
+AsyncBittrexNormalized = make_async(BittrexNormalized)
+AsyncTheRock = make_async(TheRock)
+AsyncTheRockNormalized = make_async(TheRockNormalized)
+AsyncHitbtc = make_async(Hitbtc)
+AsyncHitbtcNormalized = make_async(HitbtcNormalized)
+AsyncBitstamp = make_async(Bitstamp)
+AsyncBitstampNormalized = make_async(BitstampNormalized)
+AsyncBinance = make_async(Binance)
+AsyncBinanceNormalized = make_async(BinanceNormalized)
+AsyncBitkonan = make_async(Bitkonan)
+AsyncKraken = make_async(Kraken)
+AsyncKrakenNormalized = make_async(KrakenNormalized)
+AsyncBitmex = make_async(Bitmex)
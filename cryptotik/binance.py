@@ -2,13 +2,14 @@
 
 ''' Binance exchange '''
 
-import hmac
 import hashlib
 import time
+import functools
 import requests
 from decimal import Decimal
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError, APIError)
 from datetime import datetime
@@ -19,13 +20,18 @@ class Binance(ExchangeWrapper):
 
     name = "binance"
     url = 'https://api.binance.com/'
+    digestmod = hashlib.sha256  # of the HMAC signing private calls
     delimiter = ""
     headers = headers
     taker_fee, maker_fee = 0.001, 0.001
     base_currencies = ['btc', 'eth', 'bnb', 'usdt']
     quote_order = 0
+    rate_limits = {'weight': (1200, 20),  # 1200 request weight per minute
+                   'orders': (10, 10)}  # 10 orders per second
+    cache_ttl = {'api/v1/exchangeInfo': 300}
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
 
         if apikey and secret:
             self.apikey = apikey
@@ -40,39 +46,66 @@ class Binance(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     def get_base_currencies(self):
         raise NotImplementedError
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
         '''verify if API responded properly and raise apropriate error.'''
 
-        if "msg" in response.json() and "code" in response.json():
-            raise APIError(response.json()['msg'])
+        if "msg" in data and "code" in data:
+            raise APIError(data['msg'])
 
     def _generate_signature(self, query):
 
-        return hmac.new(self.secret, query,
-                        hashlib.sha256).hexdigest()
+        return self.signer.sign(query).hexdigest()
 
+    @staticmethod
+    def _weight(url, params):
+        '''request weight of the endpoint,
+        https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md'''
+
+        params = dict(params or ())
+
+        if url.endswith('depth'):
+            limit = int(params.get('limit', 100))
+            return 1 if limit <= 100 else limit // 100  # 500: 5, 1000: 10, 5000: 50
+        if url.endswith(('ticker/24hr', 'openOrders')) and 'symbol' not in params:
+            return 40
+        if url.endswith('ticker/allPrices'):
+            return 2
+        if url.endswith('account'):
+            return 5
+
+        return 1
+
+    @public_call
     def api(self, url, params):
         '''call api'''
 
+        self._throttle('weight', self._weight(url, params))
+
         try:
             response = self.api_session.get(url, params=params, headers=self.headers,
                                             timeout=self.timeout, proxies=self.proxy)
             response.raise_for_status()
 
         except requests.exceptions.HTTPError as e:
+            self._backoff(e.response, 'weight')
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data)
+        return data
 
     def private_api(self, url, params={}, http_method='GET'):
         '''handles private api methods'''
 
+        self._throttle('weight', self._weight(url, params))
+        if http_method == 'POST' and url.endswith('order'):
+            self._throttle('orders')
+
         query = requests.compat.urlencode(sorted(params.items()))
         query += "&timestamp={}".format(int(time.time() * 1000))
         query += "&signature={}".format(self._generate_signature(query.encode('utf-8')))
@@ -85,12 +118,15 @@ class Binance(ExchangeWrapper):
             response.raise_for_status()
 
         except requests.exceptions.HTTPError as e:
+            self._backoff(e.response, 'weight')
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data)
+        return data
 
     @classmethod
+    @indexed
     def format_pair(self, pair):
         '''Format the pair argument to format understood by remote API.'''
 
@@ -371,10 +407,42 @@ class Binance(ExchangeWrapper):
                                 "orderId": order_id},
                                 http_method='DELETE')
 
-    def cancel_all_orders(self):
+    def cancel_all_orders(self, deadline=None):
+        '''cancel all open orders, with one DELETE openOrders request per symbol
+        sent concurrently, within <deadline> seconds if given.
+        Orders of symbols the request failed for are cancelled one by one.
+        return dict of order id: True, or the exception which prevented it's cancel.'''
+
+        start = time.monotonic()
+        orders = self._within(self.get_open_orders, deadline, start)
+        symbols = {}
+
+        if isinstance(orders, Exception):
+            raise orders
+
+        for order in orders:
+            symbols.setdefault(order['symbol'], []).append(order['orderId'])
 
-        for order in self.get_open_orders():
-            self.cancel_order(order['orderId'], order['symbol'])
+        calls = {s: functools.partial(self.private_api, self.url + "/api/v3/openOrders",
+                                      params={'symbol': s}, http_method='DELETE')
+                 for s in symbols}
+        done = self._run_concurrently(calls, self._remaining(deadline, start))
+        results, failed = {}, {}
+
+        for symbol, order_ids in symbols.items():
+            if isinstance(done[symbol], Exception):
+                failed.update({i: functools.partial(self.cancel_order, i, symbol)
+                               for i in order_ids})
+                continue
+
+            # OCO lists are reported as a whole, their orders in 'orderReports'
+            cancelled = {i['orderId'] for entry in done[symbol]
+                         for i in entry.get('orderReports', [entry])}
+            for i in order_ids:
+                results[i] = True if i in cancelled else APIError('Order was not cancelled.')
+
+        results.update(self._cancel_each(failed, deadline, start))
+        return results
 
     def get_nonce(self):
         pass
@@ -382,10 +450,12 @@ class Binance(ExchangeWrapper):
 
 class BinanceNormalized(Binance, NormalizedExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
-        super(BinanceNormalized, self).__init__(apikey, secret, timeout, proxy)
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
+        super(BinanceNormalized, self).__init__(apikey, secret, timeout, proxy, transport)
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -440,12 +510,29 @@ class BinanceNormalized(Binance, NormalizedExchangeWrapper):
 
         ticker = super(BinanceNormalized, self).get_market_ticker(market)
 
+        return self._normalize_ticker(ticker)
+
+    @staticmethod
+    def _normalize_ticker(ticker):
+
         return {
             'ask': float(ticker['askPrice']),
             'bid': float(ticker['bidPrice']),
             'last': float(ticker['lastPrice'])
         }
 
+    def get_market_tickers(self, pairs=None):
+        '''tickers of <pairs>, all of them when None, from a single ticker/24hr request'''
+
+        if pairs is None:
+            pairs = self.get_markets()
+
+        pairs = {self.format_pair(i): i for i in pairs}
+        tickers = {i['symbol']: i for i in self.get_summaries()}
+
+        return {pair: self._normalize_ticker(tickers[symbol])
+                for symbol, pair in pairs.items() if symbol in tickers}
+
     def get_market_trade_history(self, market, depth=100):
         '''
         :return:
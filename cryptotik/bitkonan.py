@@ -5,15 +5,16 @@
 import requests
 from decimal import Decimal
 import time
-import hmac
 import hashlib
-from cryptotik.common import headers, ExchangeWrapper
+from cryptotik.common import (headers, ExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import APIError
 
 
 class Bitkonan(ExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
 
         if apikey and secret:
             self.apikey = apikey
@@ -28,7 +29,7 @@ class Bitkonan(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     public_commands = ("ticker", "transactions", "order_book")
     private_commands = ("balance", "user_transactions", "open_orders", "order_status",
@@ -37,6 +38,7 @@ class Bitkonan(ExchangeWrapper):
 
     name = 'bitkonan'
     url = 'https://www.bitkonan.com/'
+    digestmod = hashlib.sha256  # of the HMAC signing private calls
     api_url = url + 'api/'
     private_api_url = api_url + 'private/'
     delimiter = "/"
@@ -50,19 +52,14 @@ class Bitkonan(ExchangeWrapper):
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time()), nonce)
-        return self._nonce
+        return self._next_nonce()
 
     def get_base_currencies(self):
         
         return self.base_currencies
 
     @classmethod
+    @indexed
     def format_pair(cls, pair):
         """format the pair argument to format understood by remote API."""
 
@@ -73,14 +70,15 @@ class Bitkonan(ExchangeWrapper):
         else:
             return pair
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
         
-        if 'errors' in response.json().keys():
-            raise APIError(response.json()['errors'])
+        if 'errors' in data.keys():
+            raise APIError(data['errors'])
 
     def _generate_signature(self):
         raise NotImplementedError
 
+    @public_call
     def api(self, command, params={}):
         """call remote API"""
 
@@ -94,7 +92,7 @@ class Bitkonan(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        return result.json()
+        return decode(result)
 
     def private_api(self, command, params=None):
         '''handles private api methods'''
@@ -104,9 +102,7 @@ class Bitkonan(ExchangeWrapper):
 
         tstamp = str(int(time.time()))
         msg = (self.apikey + tstamp).encode('utf-8')
-        sign = hmac.new(self.secret, 
-                        msg, 
-                        hashlib.sha256).hexdigest()
+        sign = self.signer.sign(msg).hexdigest()
         data = {'key': self.apikey,
                 'timestamp': tstamp,
                 'sign': sign}
@@ -123,8 +119,9 @@ class Bitkonan(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(response)
-        return response.json()['data']
+        data = decode(response)
+        self._verify_response(data)
+        return data['data']
 
     def get_markets(self):
         '''get all market pairs supported by the exchange'''
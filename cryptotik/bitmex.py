@@ -2,19 +2,20 @@
 
 import requests
 import hashlib
-import hmac
 import json
 from decimal import Decimal
 import time
 from cryptotik.common import is_sale
-from cryptotik.common import (headers, ExchangeWrapper)
+from cryptotik.common import (headers, ExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import APIError
+from cryptotik.cache import Snapshot
 
 
 class Bitmex(ExchangeWrapper):
 
     def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
-                 testnet=False):
+                 testnet=False, transport=None):
 
         if apikey and secret:
             self.apikey = apikey
@@ -29,12 +30,16 @@ class Bitmex(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
         if testnet:
             self.url = 'https://testnet.bitmex.com/api/v1'
 
+        self.instruments = Snapshot(lambda: {i['symbol']: i for i in self.api("/instrument/active")},
+                                    self.snapshot_max_age)
+
     url = 'https://bitmex.com/api/v1'
+    digestmod = hashlib.sha256  # of the HMAC signing private calls
     name = 'bitmex'
     delimiter = ""
     case = "upper"
@@ -42,22 +47,20 @@ class Bitmex(ExchangeWrapper):
     maker_fee, taker_fee = 0.002, 0.002
     base_currencies = ['xbt']
     quote_order = 0
+    rate_limits = {'public': (30, 0.5),  # 30 requests per minute
+                   'private': (60, 1)}  # 60 requests per minute when authenticated
+    snapshot_max_age = 5  # seconds active instruments are reused for
 
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time()), nonce)
-        return self._nonce
+        return self._next_nonce()
 
     def get_base_currencies(self):
         raise NotImplementedError
 
     @classmethod
+    @indexed
     def format_pair(cls, pair):
         """format the pair argument to format understood by remote API."""
 
@@ -71,18 +74,21 @@ class Bitmex(ExchangeWrapper):
         else:
             return pair
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
         '''verify if API responded properly and raise apropriate error.'''
 
         try:
-            if response.json()['error']:
-                raise APIError(response.json())
+            if data['error']:
+                raise APIError(data)
         except TypeError:
             pass
 
+    @public_call
     def api(self, command):
         """call remote API"""
 
+        self._throttle('public')
+
         try:
             result = self.api_session.get(self.url + command, headers=self.headers,
                                           timeout=self.timeout, proxies=self.proxy)
@@ -92,8 +98,9 @@ class Bitmex(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(result)
-        return result.json()
+        data = decode(result)
+        self._verify_response(data)
+        return data
 
     def _generate_signature(self, url: str,
                             params: dict,
@@ -110,10 +117,7 @@ class Bitmex(ExchangeWrapper):
 
         message += str(json.dumps(params)).replace(" ", "")
 
-        signature = hmac.new(bytes(self.secret, 'utf8'),
-                             bytes(message, 'utf8'),
-                             digestmod=hashlib.sha256).hexdigest()
-        return signature
+        return self.signer.sign(message.encode('utf8')).hexdigest()
 
     def private_api(self,
                     url: str,
@@ -121,10 +125,12 @@ class Bitmex(ExchangeWrapper):
                     http_method: str):
         '''handles private api methods'''
 
+        self._throttle('private', key=self.apikey)
+
         call_url = self.url + url + "?" + requests.compat.urlencode(params)
 
         expires = int(round(time.time()) + 5)  # 5s grace period in case of clock skew
-        self.headers.update({
+        headers = dict(self.headers, **{
             'api-expires': str(expires),
             'api-key': self.apikey,
             'api-signature': self._generate_signature(call_url, params,
@@ -144,22 +150,19 @@ class Bitmex(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(result)
-        return result.json()
+        data = decode(result)
+        self._verify_response(data)
+        return data
 
     def get_markets(self):
         '''get all pairs supported by the exchange'''
 
-        q = self.api("/instrument/active")
-
-        return [i['symbol'] for i in q]
+        return list(self.instruments.get())
 
     def get_market_ticker(self, pair):
         """return ticker for market"""
 
-        pair = self.format_pair(pair)
-
-        q = [i for i in self.api("/instrument/active") if i['symbol'] == pair][0]
+        q = self.instruments.get()[self.format_pair(pair)]
 
         return {
                 'lastPrice': q['lastPrice'],
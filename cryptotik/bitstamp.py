@@ -4,13 +4,12 @@
 
 import requests
 from decimal import Decimal
-import time
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError,
                                   APIError)
-import hmac
 import hashlib
 from datetime import datetime
 
@@ -18,7 +17,7 @@ from datetime import datetime
 class Bitstamp(ExchangeWrapper):
 
     def __init__(self, apikey=None, secret=None, customer_id=None,
-                 timeout=None, proxy=None):
+                 timeout=None, proxy=None, transport=None):
 
         if apikey:
             self._apikey = apikey
@@ -34,7 +33,7 @@ class Bitstamp(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     public_commands = ("ticker", "transactions", "order_book")
     private_commands = ("balance", "user_transactions", "open_orders", "order_status",
@@ -43,6 +42,7 @@ class Bitstamp(ExchangeWrapper):
 
     name = 'bitstamp'
     url = 'https://www.bitstamp.net/'
+    digestmod = hashlib.sha256  # of the HMAC signing private calls
     api_url = url + 'api/'
     delimiter = ""
     case = "lower"
@@ -52,22 +52,18 @@ class Bitstamp(ExchangeWrapper):
     maker_fee, taker_fee = 0.002, 0.002
     quote_order = 0
     base_currencies = ['usd', 'eur', 'btc']
+    rate_limits = {'api': (8000, 8000 / 600)}  # 8000 requests per 10 minutes
 
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time() * 1000000), nonce)
-        return self._nonce
+        return self._next_nonce(1000000)
 
     def get_base_currencies(self):
         raise NotImplementedError
 
     @classmethod
+    @indexed
     def format_pair(cls, pair):
         """format the pair argument to format understood by remote API."""
 
@@ -78,25 +74,30 @@ class Bitstamp(ExchangeWrapper):
         else:
             return pair
 
-    def _verify_response(self, response):
+    def _verify_response(self, data, url):
         '''verify if API responded properly and raise apropriate error.'''
 
-        if 'v2' in response.url:  # works only for v2 calls
+        if 'v2' in url:  # works only for v2 calls
             try:
-                if response.json()['error']:
-                    raise APIError(response.json()['reason'])
+                if data['error']:
+                    raise APIError(data['reason'])
             except (KeyError, TypeError):
                 pass
 
+    def _signing_key(self):
+
+        return self._secret.encode('utf-8') if getattr(self, '_secret', None) else None
+
     def _generate_signature(self, message):
 
-        return hmac.new(self._secret.encode('utf-8'),
-                        msg=message.encode('utf-8'),
-                        digestmod=hashlib.sha256).hexdigest().upper()
+        return self.signer.sign(message.encode('utf-8')).hexdigest().upper()
 
+    @public_call
     def api(self, command):
         """call remote API"""
 
+        self._throttle('api')
+
         try:
             response = self.api_session.get(self.api_url + 'v2/' + command, headers=self.headers,
                                             timeout=self.timeout, proxies=self.proxy)
@@ -106,8 +107,9 @@ class Bitstamp(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             raise APIError(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data, response.url)
+        return data
 
     def private_api(self, command, data={}):
         '''handles private api methods'''
@@ -115,6 +117,8 @@ class Bitstamp(ExchangeWrapper):
         if not self._customer_id or not self._apikey or not self._secret:
             raise ValueError("A Key, Secret and customer_id required!")
 
+        self._throttle('api')
+
         nonce = self.get_nonce()
         data['key'] = self._apikey
         message = str(nonce) + self._customer_id + self._apikey
@@ -133,8 +137,9 @@ class Bitstamp(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data, response.url)
+        return data
 
     def get_markets(self):
         '''get all market pairs supported by the exchange'''
@@ -318,10 +323,13 @@ class Bitstamp(ExchangeWrapper):
 
 class BitstampNormalized(Bitstamp, NormalizedExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, customer_id=None, timeout=None, proxy=None):
-        super(BitstampNormalized, self).__init__(apikey, secret, customer_id, timeout, proxy)
+    def __init__(self, apikey=None, secret=None, customer_id=None, timeout=None, proxy=None,
+                 transport=None):
+        super(BitstampNormalized, self).__init__(apikey, secret, customer_id, timeout, proxy,
+                                                 transport)
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -2,14 +2,15 @@
 
 import requests
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError,
                                   APIError,
                                   OutdatedBaseCurrenciesError)
 from cryptotik.common import is_sale
 import time
-import hmac
+import functools
 import hashlib
 from datetime import datetime
 from decimal import Decimal
@@ -19,6 +20,7 @@ class Bittrex(ExchangeWrapper):
 
     name = 'bittrex'
     url = 'https://bittrex.com/api/v1.1/'
+    digestmod = hashlib.sha512  # of the HMAC signing private calls
     url2 = 'https://bittrex.com/Api/v2.0/'
     delimiter = "-"
     headers = headers
@@ -29,8 +31,11 @@ class Bittrex(ExchangeWrapper):
                        'withdraw')
     base_currencies = ['btc', 'eth', 'usdt']
     quote_order = 1
+    rate_limits = {'api': (60, 1)}  # 60 calls per minute
+    cache_ttl = {'public/getmarkets': 300, 'public/getcurrencies': 300}
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
         '''initialize bittrex class'''
 
         if apikey and secret:
@@ -46,7 +51,7 @@ class Bittrex(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     def get_base_currencies(self):
         '''return base markets supported by this exchange.'''
@@ -62,15 +67,10 @@ class Bittrex(ExchangeWrapper):
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time()), nonce)
-        return self._nonce
+        return self._next_nonce()
 
     @classmethod
+    @indexed
     def format_pair(self, pair):
         """format the pair argument to format understood by remote API."""
 
@@ -81,19 +81,22 @@ class Bittrex(ExchangeWrapper):
         else:
             return pair
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
         '''verify if API responded properly and raise apropriate error.'''
 
-        if not response.json()['success'] is True:
-            raise APIError(response.json()['message'])
+        if not data['success'] is True:
+            raise APIError(data['message'])
 
     def _generate_signature(self, url):
 
-        return hmac.new(self.secret, url.encode(), hashlib.sha512).hexdigest()
+        return self.signer.sign(url.encode()).hexdigest()
 
+    @public_call
     def api(self, url, params):
         """call api"""
 
+        self._throttle('api')
+
         try:
             response = self.api_session.get(url, params=params, headers=self.headers,
                                             timeout=self.timeout, proxies=self.proxy)
@@ -103,18 +106,21 @@ class Bittrex(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data)
+        return data
 
     def private_api(self, url, params):
         '''handles private api methods'''
 
+        self._throttle('api')
+
         params.update({"apikey": self.apikey, "nonce": self.get_nonce()})
         url += "?" + requests.compat.urlencode(params)
-        self.headers.update({"apisign": self._generate_signature(url)
-                             })
+        headers = dict(self.headers, apisign=self._generate_signature(url))
+
         try:
-            response = self.api_session.get(url, headers=self.headers,
+            response = self.api_session.get(url, headers=headers,
                                             timeout=self.timeout,
                                             proxies=self.proxy)
 
@@ -122,8 +128,9 @@ class Bittrex(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data)
+        return data
 
     def get_market_ohlcv_data(self, market, interval, since=None):
         '''
@@ -260,10 +267,20 @@ class Bittrex(ExchangeWrapper):
         return self.private_api(self.url + "market" + "/getopenorders",
                                 params=params)["result"]
 
-    def cancel_all_orders(self):
+    def cancel_all_orders(self, deadline=None):
+        '''cancel all open orders concurrently, within <deadline> seconds if given.
+        return dict of order uuid: True, or the exception which prevented it's cancel.'''
+
+        start = time.monotonic()
+        orders = self._within(self.get_open_orders, deadline, start)
+
+        if isinstance(orders, Exception):
+            raise orders
+
+        calls = {i['OrderUuid']: functools.partial(self.cancel_order, i['OrderUuid'])
+                 for i in orders}
 
-        for order in self.get_open_orders():
-            self.cancel_order(order['OrderUuid'])
+        return self._cancel_each(calls, deadline, start)
 
     def get_order_history(self):
         """get order history"""
@@ -327,8 +344,9 @@ class Bittrex(ExchangeWrapper):
 
 class BittrexNormalized(Bittrex, NormalizedExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
-        super(BittrexNormalized, self).__init__(apikey, secret, timeout, proxy)
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
+        super(BittrexNormalized, self).__init__(apikey, secret, timeout, proxy, transport)
 
     @staticmethod
     def _iso_string_to_datetime(ts):
@@ -340,6 +358,7 @@ class BittrexNormalized(Bittrex, NormalizedExchangeWrapper):
             return datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S")
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -374,6 +393,21 @@ class BittrexNormalized(Bittrex, NormalizedExchangeWrapper):
 
         return {k.lower(): v for k, v in ticker.items()}
 
+    def get_market_tickers(self, pairs=None):
+        '''tickers of <pairs>, all of them when None, from a single getmarketsummaries request'''
+
+        tickers = {i['MarketName'].lower(): i for i in self.get_summaries()}
+
+        if pairs is None:
+            pairs = {i: '{1}-{0}'.format(*i.split('-')) for i in tickers}
+        else:
+            pairs = {self.format_pair(i): i for i in pairs}
+
+        return {pair: {'bid': tickers[symbol]['Bid'],
+                       'ask': tickers[symbol]['Ask'],
+                       'last': tickers[symbol]['Last']}
+                for symbol, pair in pairs.items() if symbol in tickers}
+
     def get_market_trade_history(self, market, depth=100):
 
         upstream = super(BittrexNormalized, self).get_market_trade_history(market, depth)
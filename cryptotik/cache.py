@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+'''caching of API responses'''
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    '''In-memory cache with per entry time to live,
+    least recently used entries are evicted once it holds <maxsize> entries.
+
+    Enable it for all wrappers with ExchangeWrapper.cache = ResponseCache(),
+    which endpoints are cached and for how long is set by the wrapper's <cache_ttl>.'''
+
+    def __init__(self, maxsize=256):
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # key: (expires, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        '''return (True, value) if <key> is cached and fresh, (False, None) otherwise.'''
+
+        with self.lock:
+            try:
+                expires, value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                return False, None
+
+            if expires < time.monotonic():
+                del self.entries[key]
+                self.misses += 1
+                return False, None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key, value, ttl):
+        '''cache <value> under <key> for <ttl> seconds.'''
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        '''return hit/miss counters'''
+
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+class DiskCache:
+    '''Cache of API responses stored as JSON files in <path>,
+    so restarted processes do not have to download them again.
+
+    Stale entries (older than their time to live, but not older than <max_stale>)
+    are served right away while a background thread fetches a fresh copy.
+    Files are replaced atomically, processes sharing <path> never read partial writes.
+
+    Enable it for all wrappers with ExchangeWrapper.disk_cache = DiskCache().'''
+
+    def __init__(self, path=None, max_stale=86400):
+
+        self.path = path or os.path.join(os.path.expanduser('~'), '.cache', 'cryptotik')
+        self.max_stale = max_stale
+        self.revalidating = set()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+
+        return os.path.join(self.path, hashlib.sha1(repr(key).encode()).hexdigest() + '.json')
+
+    def get(self, key):
+        '''return (stored, value) for <key>, None if it is not cached,
+        <stored> is unix time the entry was written.'''
+
+        try:
+            with open(self._file(key), 'rb') as f:
+                entry = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('key') != repr(key):  # hash collision
+            return None
+
+        return entry['stored'], entry['value']
+
+    def set(self, key, value):
+        '''store <value> under <key>, <value> must be JSON serializable.'''
+
+        body = json.dumps({'key': repr(key), 'stored': time.time(), 'value': value})
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(body)
+            os.replace(tmp, self._file(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def fetch(self, key, ttl, fetch):
+        '''return (value, age) for <key>, calling <fetch> when it is not cached
+        and in the background when cached value is older than <ttl> seconds.
+        <age> is seconds since the value was fetched, 0 if it was fetched just now.'''
+
+        entry = self.get(key)
+
+        if entry is not None:
+            stored, value = entry
+            age = time.time() - stored
+
+            if 0 <= age < ttl:
+                self.hits += 1
+                return value, age
+
+            if age < ttl + self.max_stale:
+                self.stale += 1
+                self.revalidate(key, fetch)
+                return value, age
+
+        self.misses += 1
+        value = fetch()
+        self.set(key, value)
+        return value, 0
+
+    def revalidate(self, key, fetch):
+        '''refresh <key> in a background thread, unless it is being refreshed already.'''
+
+        with self.lock:
+            if key in self.revalidating:
+                return
+            self.revalidating.add(key)
+
+        def run():
+            try:
+                self.set(key, fetch())
+            except Exception:
+                pass  # keep serving the stale entry, next call tries again
+            finally:
+                with self.lock:
+                    self.revalidating.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def clear(self):
+
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                os.unlink(os.path.join(self.path, name))
+
+    def stats(self):
+        '''return hit/stale/miss counters'''
+
+        return {'hits': self.hits, 'stale': self.stale, 'misses': self.misses}
+
+
+class Snapshot:
+    '''Last response of an endpoint which returns data of all markets at once,
+    lookups of single markets are served from it until it is <max_age> seconds old.'''
+
+    def __init__(self, fetch, max_age=1):
+
+        self.fetch = fetch
+        self.max_age = max_age
+        self.data = None
+        self.fetched = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        '''return the snapshot, fetched again if it is too old.
+        Concurrent callers wait for a single fetch.'''
+
+        with self.lock:
+            if self.fetched is None or time.monotonic() - self.fetched > self.max_age:
+                self.data = self.fetch()
+                self.fetched = time.monotonic()
+
+            return self.data
+
+    def invalidate(self):
+        '''next get() fetches a new snapshot'''
+
+        with self.lock:
+            self.fetched = None
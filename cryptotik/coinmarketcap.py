@@ -1,5 +1,7 @@
-from cryptotik.common import headers, ExchangeWrapper
+from cryptotik.common import headers, ExchangeWrapper, get_transport, decode
 from cryptotik.exceptions import APIError
+from cryptotik.cache import Snapshot
+import threading
 import requests
 
 
@@ -8,8 +10,9 @@ class CoinMarketCap():
     url = 'https://api.coinmarketcap.com/v1/'
     name = 'coinmarketcap'
     headers = headers
+    refresh_interval = 300  # seconds, coinmarketcap updates it's data every 5 minutes
 
-    def __init__(self, timeout=None, proxy=None):
+    def __init__(self, timeout=None, proxy=None, transport=None):
         '''initialize class'''
 
         if proxy:
@@ -21,7 +24,9 @@ class CoinMarketCap():
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
+        self.tables = {}  # convert currency: Snapshot of the indexed ticker table
+        self.lock = threading.Lock()
 
     def _verify_response(self, response):
         raise NotImplementedError
@@ -38,25 +43,47 @@ class CoinMarketCap():
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        return result.json()
+        return decode(result)
+
+    def _index(self, tickers):
+        '''index ticker list by symbol (not unique at coinmarketcap) and by id'''
+
+        symbols = {}
+        for i in tickers:
+            symbols.setdefault(i['symbol'], []).append(i)
+
+        return {'list': tickers, 'symbols': symbols,
+                'ids': {i['id']: i for i in tickers}}
+
+    def _table(self, convert_currency):
+        '''indexed ticker table for <convert_currency>, downloaded once per <refresh_interval>'''
+
+        with self.lock:
+            if convert_currency not in self.tables:
+                url = self.url + "ticker/?limit=0"
+                if convert_currency:
+                    url += "&convert=" + convert_currency
+
+                self.tables[convert_currency] = Snapshot(lambda: self._index(self.api(url)),
+                                                         self.refresh_interval)
+
+        return self.tables[convert_currency].get()
 
     def get_ticker(self, coin=None, convert_currency=None):
-        ''' Get ticker for <currency>, convert price to <convert_currency> if needed
-            Important: currency name is used instead of symbol'''
+        ''' Get ticker for <coin> symbol or id, convert price to <convert_currency> if needed'''
 
-        if not convert_currency:
-            l = self.api(self.url + "/ticker/?limit=0")
-            if coin:
-                l = [i for i in l if i['symbol'] == coin.upper()]
-            return l
-
-        if convert_currency:
-            l = self.api(self.url + "ticker/" +
-                            "?convert=" + convert_currency.upper() +
-                            "&limit=0")
-            if coin:
-                l = [i for i in l if i['symbol'] == coin.upper()]
-            return l
+        table = self._table(convert_currency.upper() if convert_currency else None)
+
+        if not coin:
+            return table['list']
+
+        if coin.upper() in table['symbols']:
+            return table['symbols'][coin.upper()]
+
+        if coin.lower() in table['ids']:
+            return [table['ids'][coin.lower()]]
+
+        return []
 
     def get_global(self, convert_currency=None):
         ''' Get global data, convert to <convert_currency> if needed'''
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from cryptotik.common import headers
+from cryptotik.common import headers, get_transport, decode
 from cryptotik.exceptions import APIError
 import requests
 import time
@@ -16,7 +16,7 @@ class CoinPaprika:
     name = "coinmarketcap"
     headers = headers
 
-    def __init__(self, timeout=None, proxy=None):
+    def __init__(self, timeout=None, proxy=None, transport=None):
         """initialize class"""
 
         if proxy:
@@ -28,7 +28,7 @@ class CoinPaprika:
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     def _verify_response(self, response):
         raise NotImplementedError
@@ -47,7 +47,7 @@ class CoinPaprika:
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        return result.json()
+        return decode(result)
 
     def get_coins(self) -> list:
         """list of all avaliable coins"""
@@ -113,8 +113,8 @@ class CoinPaprika:
 
 
 class CoinPaprikaNormalized(CoinPaprika):
-    def __init__(self, timeout=None, proxy=None):
-        super().__init__(timeout, proxy)
+    def __init__(self, timeout=None, proxy=None, transport=None):
+        super().__init__(timeout, proxy, transport)
 
     @staticmethod
     def _iso_string_to_datetime(ts):
@@ -1,6 +1,20 @@
 # -*- coding: utf-8 -*-
 
 import abc
+import hmac
+import time
+import json
+import functools
+import importlib
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING  # codings urllib3 can decode, br when brotli is installed
+from cryptotik.ratelimit import get_bucket
+from cryptotik.nonce import NonceProvider
+from cryptotik.exceptions import (APIError, InvalidBaseCurrencyError,
+                                  InvalidDelimiterError)
 
 headers = {    # common HTTPS headers
     'Accept': 'application/json',
@@ -13,12 +27,445 @@ headers = {    # common HTTPS headers
     }
 
 
+def _fastest_loads():
+    '''pick the fastest JSON decoder installed, fallback to stdlib json.'''
+
+    for module in ('orjson', 'ujson'):
+        try:
+            return importlib.import_module(module).loads
+        except ImportError:
+            pass
+
+    return json.loads
+
+
+json_loads = _fastest_loads()
+
+
+def set_decoder(loads):
+    '''plug in custom JSON decoder, <loads> takes bytes and returns python objects.'''
+
+    global json_loads
+    json_loads = loads
+
+
+def decode(response):
+    '''decode JSON body of the <response>,
+    wrappers call this exactly once per response and pass the result around.'''
+
+    return json_loads(response.content)
+
+
+class HTTPTransport:
+    '''HTTP transport shared by the exchange wrappers.
+
+    Keeps a pool of keep-alive connections for each host so consecutive calls
+    skip the TCP and TLS handshakes. Any object implementing
+    requests.Session.request can be plugged in as the <backend>.'''
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False,
+                 max_retries=0, keep_alive=True, compression=False, backend=None):
+        '''
+        : pool_connections - number of hosts to keep connection pools for
+        : pool_maxsize - max number of connections kept open to a single host
+        : pool_block - wait for a free connection instead of opening a throwaway one
+        : keep_alive - reuse connections between requests
+        : compression - negotiate gzip/deflate (and brotli if installed) encoded responses
+        : backend - requests.Session compatible object, ignores pool settings
+        '''
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+        self.compression = compression
+
+        if backend is None:
+            backend = requests.Session()
+            adapter = self._adapter(pool_maxsize)
+            backend.mount('https://', adapter)
+            backend.mount('http://', adapter)
+
+        self.backend = backend
+
+    def _adapter(self, maxsize):
+
+        return HTTPAdapter(pool_connections=self.pool_connections,
+                           pool_maxsize=maxsize,
+                           pool_block=self.pool_block,
+                           max_retries=self.max_retries)
+
+    def limit_host(self, host, maxsize):
+        '''limit the number of connections kept open to <host>,
+        example: transport.limit_host('api.binance.com', 50)'''
+
+        self.backend.mount('https://' + host, self._adapter(maxsize))
+
+    def request(self, method, url, **kwargs):
+        '''send HTTP request, accepts the same arguments as requests.request'''
+
+        if not self.keep_alive:
+            kwargs['headers'] = dict(kwargs.get('headers') or {},
+                                     Connection='close')
+
+        if self.compression:
+            kwargs['headers'] = dict(kwargs.get('headers') or {})
+            kwargs['headers']['Accept-Encoding'] = ACCEPT_ENCODING
+
+        return self.backend.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        '''close all pooled connections.'''
+
+        self.backend.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    '''return the default transport, used by every wrapper unless
+    it is given a transport of it's own.'''
+
+    global _transport
+
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport()
+
+    return _transport
+
+
+def set_transport(transport):
+    '''replace the default transport, affects wrappers created afterwards.'''
+
+    global _transport
+
+    with _transport_lock:
+        _transport = transport
+
+
+class SingleFlight:
+    '''Runs one call per key at a time, concurrent callers asking for
+    a key which is already in flight wait for it and share it's result.'''
+
+    class Call:
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        '''return fn(), or result of the fn() already in flight for <key>.'''
+
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = self.Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+        return call.result
+
+
+def _freeze(obj):
+    '''hashable version of call arguments'''
+
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(i) for i in obj)
+
+    return obj
+
+
+class Signer:
+    '''HMAC keyed once per api secret, every message is signed by a copy of it,
+    which saves preparing the key for each signature.'''
+
+    def __init__(self, key, digestmod):
+
+        self.hmac = hmac.new(key, digestmod=digestmod)
+
+    def sign(self, message):
+        '''return HMAC of <message> (bytes)'''
+
+        signature = self.hmac.copy()
+        signature.update(message)
+        return signature
+
+
+class SymbolIndex:
+    '''normalized pair <-> native symbol mapping of one exchange wrapper,
+    filled from the market list of the exchange by load_symbols()'''
+
+    def __init__(self):
+
+        self.native = {}  # pair: symbol
+        self.normalized = {}  # symbol: pair
+
+    def load(self, markets):
+        '''replace the index with (pair, symbol) tuples of <markets>'''
+
+        native = {pair.lower(): symbol for pair, symbol in markets}
+        self.native, self.normalized = native, {v: k for k, v in native.items()}
+
+
+def indexed(format_pair):
+    '''decorator for format_pair, pairs found in the SymbolIndex of the class
+    are a dict lookup, others are formatted as usual.'''
+
+    indexes = {}
+
+    @functools.wraps(format_pair)
+    def call(cls, pair):
+
+        try:
+            return indexes[cls].native[pair.lower()]
+        except (KeyError, AttributeError):  # not indexed, or bitmex list of pairs
+            return format_pair(cls, pair)
+
+    call.indexes = indexes
+    return call
+
+
+def public_call(api):
+    '''decorator for the public api() methods of the wrappers.
+
+    With <coalesce> enabled, concurrent identical calls share a single
+    HTTP request and it's decoded result.
+    With a <cache> or <disk_cache> set, results of the endpoints listed
+    in <cache_ttl> are served from them until they expire.
+    Either way callers must not mutate the result.'''
+
+    @functools.wraps(api)
+    def call(self, *args, **kwargs):
+
+        ttl = None
+        if self.cache is not None or self.disk_cache is not None:
+            ttl = self._cache_ttl(*args, **kwargs)
+
+        if not self.coalesce and ttl is None:
+            return api(self, *args, **kwargs)
+
+        key = (self.name, self.url, _freeze(args), _freeze(kwargs))
+        fetch = functools.partial(api, self, *args, **kwargs)
+
+        if self.coalesce:
+            fetch = functools.partial(self._flights.do, key, fetch)
+
+        if ttl is None:
+            return fetch()
+
+        if self.cache is not None:
+            hit, result = self.cache.get(key)
+            if hit:
+                return result
+
+        age = 0
+        if self.disk_cache is not None:
+            result, age = self.disk_cache.fetch(key, ttl, fetch)
+        else:
+            result = fetch()
+
+        if self.cache is not None and age < ttl:  # stale entries are not kept in memory
+            self.cache.set(key, result, ttl - age)  # expires when the disk entry does
+
+        return result
+
+    return call
+
+
 class ExchangeWrapper(metaclass=abc.ABCMeta):
 
+    rate_limits = {}  # scope: (capacity, refill rate per second)
+    throttled = True  # set to False to disable client side rate limiting
+    coalesce = False  # set to True to share in-flight identical public calls
+    _flights = SingleFlight()
+    cache = None  # cryptotik.cache.ResponseCache for public calls
+    disk_cache = None  # cryptotik.cache.DiskCache, survives restarts
+    cache_ttl = {}  # endpoint: seconds to keep it's responses in <cache> and <disk_cache>
+    nonce_provider = NonceProvider()  # FileNonceProvider when processes share api keys
+    cancel_workers = 8  # concurrent requests of cancel_all_orders, rate limits still apply
+
     def __init__(self, apikey, secret, timeout):
         self.apikey = apikey
         self.secret = secret
 
+    digestmod = None  # hashlib constructor of the HMAC signing private calls
+
+    def _signing_key(self):
+        '''HMAC key of the api secret, None if there is no secret'''
+
+        secret = getattr(self, 'secret', None)
+        if isinstance(secret, str):
+            secret = secret.encode('utf-8')
+        return secret or None
+
+    @property
+    def signer(self):
+        '''Signer of the current api secret, built on first use and
+        rebuilt when the secret is replaced.'''
+
+        key = self._signing_key()
+        if key is None:
+            raise ValueError('An api secret is required to sign private calls.')
+
+        signer = self.__dict__.get('_signer')
+        if signer is None or signer[0] != key:
+            signer = self._signer = (key, Signer(key, self.digestmod))
+        return signer[1]
+
+    def _run_concurrently(self, calls, timeout=None):
+        '''run <calls> (dict of key: function) on <cancel_workers> threads,
+        return dict of key: result, or the exception the call raised.
+        Calls not done within <timeout> seconds get TimeoutError, their result is discarded.'''
+
+        pool = ThreadPoolExecutor(self.cancel_workers)
+        futures = {pool.submit(fn): key for key, fn in calls.items()}
+        done, pending = wait(futures, timeout=timeout)
+        results = {}
+
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+
+        for future in pending:
+            future.cancel()
+            results[futures[future]] = TimeoutError('Deadline passed.')
+
+        pool.shutdown(wait=False)
+        return results
+
+    def _within(self, fn, deadline, start):
+        '''return fn(), or the exception it raised,
+        TimeoutError if <deadline> seconds counted from <start> pass first.'''
+
+        return self._run_concurrently({0: fn}, self._remaining(deadline, start))[0]
+
+    def _cancel_each(self, calls, deadline, start):
+        '''cancel orders one by one, <calls> is dict of order id: function cancelling it,
+        run concurrently within <deadline> seconds counted from <start>.
+        Failed cancels are retried once, one at a time, while time remains,
+        concurrent private calls may be refused for arriving with out of order nonces.
+        return dict of order id: True, or the exception which prevented the cancel.'''
+
+        results = self._run_concurrently(calls, self._remaining(deadline, start))
+
+        for order_id, result in results.items():
+            if (isinstance(result, Exception) and not isinstance(result, TimeoutError)
+                    and self._remaining(deadline, start) != 0):
+                results[order_id] = self._within(calls[order_id], deadline, start)
+
+        return {k: v if isinstance(v, Exception) else True for k, v in results.items()}
+
+    @staticmethod
+    def _remaining(deadline, start):
+        '''seconds left of <deadline> counted from <start> (time.monotonic())'''
+
+        if deadline is None:
+            return None
+
+        return max(0, deadline - (time.monotonic() - start))
+
+    def _next_nonce(self, scale=1):
+        '''nonce from <nonce_provider>, unix time multiplied by <scale> or greater'''
+
+        return self.nonce_provider.next(scale)
+
+    def _endpoint(self, *args, **kwargs):
+        '''endpoint public api() is called for, matched against <cache_ttl>'''
+
+        return str(args[0]) if args else ''
+
+    def _cache_ttl(self, *args, **kwargs):
+        '''seconds to cache response of this public api() call for, None if not cached'''
+
+        endpoint = self._endpoint(*args, **kwargs)
+
+        for suffix, ttl in self.cache_ttl.items():
+            if endpoint.endswith(suffix):
+                return ttl
+
+    def _throttle(self, scope, weight=1, key=None):
+        '''wait until <weight> calls are available in the <scope> budget,
+        <key> separates budgets which are counted per API key.'''
+
+        if not self.throttled or not weight or scope not in self.rate_limits:
+            return 0
+
+        capacity, rate = self.rate_limits[scope]
+        return get_bucket((self.name, scope, key), capacity, rate).consume(weight)
+
+    def _stream(self, url, params=None):
+        '''GET <url> without reading the body, yields the body in chunks
+        as it arrives. Connection is closed when the caller stops early.'''
+
+        try:
+            response = self.api_session.get(url, params=params, headers=self.headers,
+                                            timeout=self.timeout, proxies=self.proxy,
+                                            stream=True)
+            response.raise_for_status()
+
+        except requests.exceptions.HTTPError as e:
+            raise APIError(e)
+
+        with response:
+            yield from response.iter_content(chunk_size=16384)
+
+    def _backoff(self, response, scope, key=None):
+        '''stop calling the <scope> endpoints when exchange responds
+        with HTTP 429 (too many requests) or 418 (IP banned).'''
+
+        if response is None or response.status_code not in (418, 429):
+            return
+
+        if scope in self.rate_limits:
+            capacity, rate = self.rate_limits[scope]
+            get_bucket((self.name, scope, key), capacity, rate).pause(
+                float(response.headers.get('Retry-After', 1)))
+
     @property
     @abc.abstractmethod
     def name(self):
@@ -69,6 +516,12 @@ class ExchangeWrapper(metaclass=abc.ABCMeta):
         '''generate signed signature for the private api methods.'''
         raise NotImplementedError
 
+    @classmethod
+    def symbol_index(cls):
+        '''SymbolIndex of this class, filled by load_symbols()'''
+
+        return cls.format_pair.indexes.setdefault(cls, SymbolIndex())
+
     @classmethod
     @abc.abstractmethod
     def format_pair(self):
@@ -179,8 +632,10 @@ class ExchangeWrapper(metaclass=abc.ABCMeta):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def cancel_all_orders(self):
-        '''Cancel all active orders.'''
+    def cancel_all_orders(self, deadline=None):
+        '''Cancel all active orders, within <deadline> seconds if given.
+        return dict of order id: True, or the exception which prevented it's cancel,
+        raise if orders could neither be cancelled at once nor listed.'''
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -228,6 +683,51 @@ class NormalizedExchangeWrapper(ExchangeWrapper):
         '''
         raise NotImplementedError
 
+    def _market_symbols(self):
+        '''(normalized pair, native symbol) of every market of the exchange'''
+
+        for market in self.get_markets():
+            try:
+                yield market, self.format_pair(market)
+            except (InvalidBaseCurrencyError, InvalidDelimiterError):
+                pass
+
+    def load_symbols(self):
+        '''fill the SymbolIndex of this class from the market list of the exchange,
+        format_pair and reverse_format_pair of listed markets become dict lookups.'''
+
+        symbols = self.symbol_index()
+        symbols.load(list(self._market_symbols()))
+
+        return symbols
+
+    def reverse_format_pair(self, symbol):
+        '''normalized pair of native <symbol>,
+        market list is loaded the first time an unknown symbol is asked for.'''
+
+        symbols = self.symbol_index()
+
+        if symbol not in symbols.normalized:
+            symbols = self.load_symbols()
+
+        return symbols.normalized[symbol]
+
+    def get_market_tickers(self, pairs=None):
+        '''
+        :params:
+            pairs: list of str, every market of the exchange when None
+        :return:
+            dict[pair: dict['ask': float, 'bid': float, 'last': float]]
+
+        wrappers of exchanges which return many tickers at once
+        override this to fetch them in a single request.
+        '''
+
+        if pairs is None:
+            pairs = self.get_markets()
+
+        return {pair: self.get_market_ticker(pair) for pair in pairs}
+
 
 def is_sale(t):
     '''if <t> is sale, return True'''
@@ -2,11 +2,11 @@
 
 ''' Hitbct exchange '''
 
-import time
 import requests
 from decimal import Decimal
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError, APIError)
 import dateutil.parser
@@ -21,8 +21,11 @@ class Hitbtc(ExchangeWrapper):
     headers = headers
     base_currencies = ['btc', 'eth', 'usd']
     quote_order = 0
+    rate_limits = {'api': (100, 100)}  # 100 requests per second
+    cache_ttl = {'public/symbol': 300, 'public/currency': 300}
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
         '''initialize object from Hitbtc class'''
 
         if apikey and secret:
@@ -38,20 +41,15 @@ class Hitbtc(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time()), nonce)
-        return self._nonce
+        return self._next_nonce()
 
     @classmethod
+    @indexed
     def format_pair(self, pair):
         '''Format the pair argument to format understood by remote API.'''
 
@@ -61,29 +59,34 @@ class Hitbtc(ExchangeWrapper):
     def get_base_currencies(self):
         raise NotImplementedError
 
-    def _verify_response(self, response):
-        if type(response.json()) is dict and 'error' in response.json():
-            raise APIError(response.json()['error'])
+    def _verify_response(self, data):
+        if type(data) is dict and 'error' in data:
+            raise APIError(data['error'])
 
     def _generate_signature(self):
         pass  # not required for this exchange
 
+    @public_call
     def api(self, url, params={}):
         '''call api'''
 
+        self._throttle('api')
+
         try:
-            result = requests.get(url, params=params, headers=self.headers,
-                                  timeout=self.timeout, proxies=self.proxy)
+            result = self.api_session.get(url, params=params, headers=self.headers,
+                                          timeout=self.timeout, proxies=self.proxy)
             result.raise_for_status()
 
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        return result.json()
+        return decode(result)
 
     def private_api(self, url, params={}, http_method='GET'):
         '''handles private api methods'''
 
+        self._throttle('api')
+
         if http_method == 'GET':
             try:
                 result = self.api_session.get(url, auth=(self.apikey, self.secret), proxies=self.proxy)
@@ -117,8 +120,9 @@ class Hitbtc(ExchangeWrapper):
             except requests.exceptions.HTTPError as e:
                 print(e)
 
-        self._verify_response(result)
-        return result.json()
+        data = decode(result)
+        self._verify_response(data)
+        return data
 
     def get_market_ticker(self, pair):
         '''returns simple current market status report'''
@@ -258,10 +262,12 @@ class Hitbtc(ExchangeWrapper):
 
 class HitbtcNormalized(Hitbtc):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
-        super(HitbtcNormalized, self).__init__(apikey, secret, timeout, proxy)
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
+        super(HitbtcNormalized, self).__init__(apikey, secret, timeout, proxy, transport)
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -314,12 +320,33 @@ class HitbtcNormalized(Hitbtc):
 
         ticker = super(HitbtcNormalized, self).get_market_ticker(market)
 
+        return self._normalize_ticker(ticker)
+
+    @staticmethod
+    def _normalize_ticker(ticker):
+        '''prices are null on markets without orders or trades, those become nan'''
+
+        def price(key):
+            return float('nan') if ticker[key] is None else float(ticker[key])
+
         return {
-            'ask': float(ticker['ask']),
-            'bid': float(ticker['bid']),
-            'last': float(ticker['last'])
+            'ask': price('ask'),
+            'bid': price('bid'),
+            'last': price('last')
         }
 
+    def get_market_tickers(self, pairs=None):
+        '''tickers of <pairs>, all of them when None, from a single ticker request'''
+
+        if pairs is None:
+            pairs = self.get_markets()
+
+        pairs = {self.format_pair(i).upper(): i for i in pairs}
+        tickers = {i['symbol']: i for i in self.api(self.url + "public/ticker")}
+
+        return {pair: self._normalize_ticker(tickers[symbol])
+                for symbol, pair in pairs.items() if symbol in tickers}
+
     def get_market_trade_history(self, market, depth=100):
         '''
         :return:
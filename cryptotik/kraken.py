@@ -1,15 +1,18 @@
 # -*- coding: utf-8 -*-
 
-import hmac
 import hashlib
 import time
+import functools
 import base64
 import requests
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError,
                                   APIError)
+from cryptotik.streaming import read_order_book
+from cryptotik.cache import Snapshot, ResponseCache
 from re import findall
 from decimal import Decimal
 from datetime import datetime
@@ -18,14 +21,25 @@ from datetime import datetime
 class Kraken(ExchangeWrapper):
 
     url = 'https://api.kraken.com/0/'
+    digestmod = hashlib.sha512  # of the HMAC signing private calls
     name = 'kraken'
     delimiter = ""
     headers = headers
     taker_fee, maker_fee = 0.00, 0.00
     quote_order = 0
     base_currencies = ['xbt', 'eur', 'usd', 'eth', 'cad', 'gbp', 'jpy']
+    rate_limits = {'public': (1, 1),
+                   'private': (15, 0.33)}  # call counter of max 15, decreasing by 1 every 3 seconds
+    private_costs = {'private/Ledgers': 2, 'private/QueryLedgers': 2,
+                     'private/TradesHistory': 2, 'private/QueryTrades': 2,
+                     'private/AddOrder': 0, 'private/CancelOrder': 0}  # orders have separate limits
+    cache_ttl = {'public/AssetPairs': 300, 'public/Assets': 300}
+    snapshot_max_age = 3600  # seconds asset and pair index is reused for
+    deposit_method_ttl = 86400  # seconds, deposit methods of an asset rarely change
+    _deposit_methods = ResponseCache(maxsize=1024)  # (apikey, asset): method, shared by instances
 
     @classmethod
+    @indexed
     def format_pair(cls, pair):
         """format the pair argument to format understood by remote API."""
 
@@ -34,7 +48,8 @@ class Kraken(ExchangeWrapper):
     def get_base_currencies(self):
         raise NotImplementedError
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
         '''initialize class'''
 
         if apikey and secret:
@@ -50,21 +65,31 @@ class Kraken(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
+        self.asset_index = Snapshot(self._index_assets, self.snapshot_max_age)
+        self.pair_index = Snapshot(self._index_pairs, self.snapshot_max_age)
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
 
-        if response.json()['error']:
-            raise APIError(response.json()['error'])
+        if data['error']:
+            raise APIError(data['error'])
+
+    def _signing_key(self):
+        '''kraken api secret is base64 encoded'''
+
+        secret = super(Kraken, self)._signing_key()
+        return secret and base64.b64decode(secret)
 
     def _generate_signature(self, message):
 
-        sig = hmac.new(base64.b64decode(self.secret), message, hashlib.sha512)
-        return base64.b64encode(sig.digest()).decode()
+        return base64.b64encode(self.signer.sign(message).digest()).decode()
 
+    @public_call
     def api(self, url, params=None):
         '''call api'''
 
+        self._throttle('public')
+
         try:
             result = self.api_session.get(url, headers=self.headers, 
                                           params=params, timeout=self.timeout,
@@ -75,18 +100,21 @@ class Kraken(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(result)
-        return result.json()['result']
+        data = decode(result)
+        self._verify_response(data)
+        return data['result']
 
     def get_nonce(self):
         '''return nonce integer'''
 
-        return int(1000 * time.time())
+        return self._next_nonce(1000)
 
     def private_api(self, url, params={}):
         '''handles private api methods'''
 
         urlpath = url[22:]
+        self._throttle('private', self.private_costs.get(url[len(self.url):], 1),
+                       key=self.apikey)
         data = params
         data['nonce'] = self.get_nonce()
         postdata = requests.compat.urlencode(data)
@@ -104,8 +132,32 @@ class Kraken(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(result)
-        return result.json()['result']
+        data = decode(result)
+        self._verify_response(data)
+        return data['result']
+
+    def _index_assets(self):
+        '''index Assets, kraken asset name: altname ('XXBT': 'XBT')'''
+
+        return {k: v['altname'] for k, v in self.api(self.url + "public/Assets").items()}
+
+    def _index_pairs(self):
+        '''index AssetPairs:
+            pairs: kraken pair name: dict['altname', 'wsname', 'base', 'quote'],
+                   base and quote are asset altnames
+            altnames: pair altname: kraken pair name'''
+
+        assets = self.asset_index.get()
+        pairs = {}
+
+        for name, pair in self.api(self.url + "public/AssetPairs").items():
+            pairs[name] = {'altname': pair['altname'],
+                           'wsname': pair.get('wsname'),
+                           'base': assets.get(pair['base'], pair['base']),
+                           'quote': assets.get(pair['quote'], pair['quote'])}
+
+        return {'pairs': pairs,
+                'altnames': {v['altname']: k for k, v in pairs.items()}}
 
     def get_markets(self):
         '''Find supported markets on this exchange'''
@@ -144,12 +196,26 @@ class Kraken(ExchangeWrapper):
         return self.api(self.url + "public/Trades",
                         params={'pair': p})[p][:limit]
 
-    def get_market_orders(self, pair, depth=100):
-        '''return order book for the market'''
+    def get_market_orders(self, pair, depth=100, stream=False, notional=None):
+        '''return order book for the market
+
+        stream=True parses the order book while it is downloaded,
+        with <notional> it stops once the levels on each side are worth
+        <notional> (sum of price * volume) instead of reading all <depth> levels.'''
 
         p = self.format_pair(pair)
-        r = self.api(self.url + "public/Depth",
-                     params={'pair': p, 'count': depth})
+        params = {'pair': p, 'count': depth}
+
+        if stream or notional is not None:
+            self._throttle('public')
+            r = read_order_book(self._stream(self.url + "public/Depth", params),
+                                depth, notional)
+            if 'asks' not in r and 'bids' not in r:  # error, or a book without levels
+                self._verify_response(r)
+                r = list(r['result'].values())[0]
+            return r
+
+        r = self.api(self.url + "public/Depth", params=params)
 
         pair_full_name = list(r.keys())[0]  # hack around this crazy naming scheme
 
@@ -168,22 +234,37 @@ class Kraken(ExchangeWrapper):
         return self.private_api(self.url + "private/Balance")
 
     def get_deposit_method(self, currency):
+        '''deposit method of <currency>, cached for <deposit_method_ttl> seconds'''
+
+        key = (getattr(self, 'apikey', None), currency.upper())
+        hit, method = self._deposit_methods.get(key)
+
+        if not hit:
+            method = self.private_api(self.url + "private/DepositMethods",
+                                      params={'asset': currency.upper()}
+                                      )[0]['method']
+            self._deposit_methods.set(key, method, self.deposit_method_ttl)
+
+        return method
 
-        return self.private_api(self.url + "private/DepositMethods",
-                                params={'asset': currency.upper()}
-                                )[0]['method']
+    def prefetch_deposit_methods(self, currencies):
+        '''cache deposit methods of all <currencies> up front,
+        so later address and history lookups cost a single private call.'''
+
+        return {i: self.get_deposit_method(i) for i in currencies}
 
     def get_deposit_address(self, currency):
         ''' get deposit address for <currency> '''
 
+        method = self.get_deposit_method(currency)
         result = self.private_api(self.url + "private/DepositAddresses",
                                 params={'asset': currency.upper(),
-                                'method': self.get_deposit_method(currency)}
+                                'method': method}
                                 )
         if result == []:
             result = self.private_api(self.url + "private/DepositAddresses",
                                 params={'asset': currency.upper(),
-                                'method': self.get_deposit_method(currency),
+                                'method': method,
                                 'new': 'true'}
                                 )
 
@@ -307,41 +388,36 @@ class Kraken(ExchangeWrapper):
         return self.private_api(self.url + "private/CancelOrder",
                             params={'txid': orderId})
 
-    def cancel_all_orders(self):
-        """cancel all orders"""
+    def cancel_all_orders(self, deadline=None):
+        '''cancel all orders with a single CancelAll request, within <deadline> seconds if given.
+        Open orders are listed first to report on, within half the deadline, a failed
+        listing does not hold back the cancel, but it's result is then {}.
+        If the cancel fails, listed orders are cancelled one by one.
+        return dict of txid: True, or the exception which prevented it's cancel.'''
+
+        start = time.monotonic()
+        listed = self._within(self.get_open_orders, deadline and deadline / 2, start)
+        done = self._within(functools.partial(self.private_api, self.url + "private/CancelAll",
+                                              params={}), deadline, start)
+
+        if not isinstance(done, Exception):
+            return dict.fromkeys(listed, True) if not isinstance(listed, Exception) else {}
+
+        if isinstance(listed, Exception):
+            raise done
 
-        for txid in self.get_open_orders():
-            self.cancel_order(txid)
+        calls = {i: functools.partial(self.cancel_order, i) for i in listed}
+        return self._cancel_each(calls, deadline, start)
 
 
 class KrakenNormalized(Kraken, NormalizedExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
-        super(KrakenNormalized, self).__init__(apikey, secret, timeout, proxy)
-
-    _names = {  # kraken has unique quote names, this will normalize it
-        'GNO': 'GNO',
-        'EOS': 'EOS',
-        'DASH': 'DASH',
-        'BCH': 'BCH',
-        'XETC': 'ETC',
-        'XETH': 'ETH',
-        'XLTC': 'LTC',
-        'XXBT': 'XBT',
-        'XXMR': 'XMR',
-        'XXRP': 'XRP',
-        'XZEC': 'ZEC',
-        'XMLN': 'MLN',
-        'XREP': 'REP',
-        'XXLM': 'XLM',
-        'ZEUR': 'EUR',
-        'ZUSD': 'USD',
-        'ZCAD': 'CAD',
-        'ZGBP': 'GBP',
-        'ZJPY': 'JPY'
-    }
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
+        super(KrakenNormalized, self).__init__(apikey, secret, timeout, proxy, transport)
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -377,18 +453,17 @@ class KrakenNormalized(Kraken, NormalizedExchangeWrapper):
         else:
             return False
 
-    def get_markets(self):
+    def _market_symbols(self):
 
-        upstream = super(KrakenNormalized, self).get_markets()
+        for name, pair in self.pair_index.get()['pairs'].items():
+            if name.endswith('.d') or pair['quote'].lower() not in self.base_currencies:
+                continue  # dark pool, or not a normalized market
 
-        quotes = []
+            yield pair['base'].lower() + '-' + pair['quote'].lower(), pair['altname']
 
-        for i in upstream:
-            for base in self.base_currencies:
-                if base in i:
-                    quotes.append("".join(i.rsplit(base, 1)) + '-' + base)
+    def get_markets(self):
 
-        return quotes
+        return [market for market, symbol in self._market_symbols()]
 
     def get_market_ticker(self, market):
         '''
@@ -399,17 +474,41 @@ class KrakenNormalized(Kraken, NormalizedExchangeWrapper):
 
         ticker = super(KrakenNormalized, self).get_market_ticker(market)
 
+        return self._normalize_ticker(ticker)
+
+    @staticmethod
+    def _normalize_ticker(ticker):
+
         return {
             'ask': ticker['a'][0],
             'bid': ticker['b'][0],
             'last': ticker['c'][0]
         }
 
+    def get_market_tickers(self, pairs=None):
+        '''tickers of <pairs>, all of them when None, from a single Ticker request'''
+
+        if pairs is None:
+            pairs = self.get_markets()
+
+        pairs = {self.format_pair(i): i for i in pairs}
+        tickers = self.api(self.url + "public/Ticker", params={'pair': ','.join(pairs)})
+
+        if not all(i in tickers for i in pairs):  # answered with kraken's own pair names
+            names = self.pair_index.get()['pairs']
+            tickers = dict(tickers, **{v['altname']: tickers[k]
+                                       for k, v in names.items() if k in tickers})
+
+        return {pair: self._normalize_ticker(tickers[symbol])
+                for symbol, pair in pairs.items() if symbol in tickers}
+
     def get_balances(self):
 
         ticker = super(KrakenNormalized, self).get_balances()
 
-        return {self._names[k]: v for k, v in ticker.items()}
+        assets = self.asset_index.get()
+
+        return {assets.get(k, k): v for k, v in ticker.items()}
 
     def get_market_trade_history(self, market, depth=100):
         '''
@@ -436,7 +535,7 @@ class KrakenNormalized(Kraken, NormalizedExchangeWrapper):
 
         return downstream
 
-    def get_market_orders(self, market, depth=100):
+    def get_market_orders(self, market, depth=100, stream=False, notional=None):
         '''
         :return:
             dict['bids': list[price, quantity],
@@ -446,7 +545,8 @@ class KrakenNormalized(Kraken, NormalizedExchangeWrapper):
         asks[0] should be first next to the spread
         '''
 
-        upstream = super(KrakenNormalized, self).get_market_orders(market, depth)
+        upstream = super(KrakenNormalized, self).get_market_orders(market, depth,
+                                                                   stream, notional)
 
         return {
             'bids': [[i[0], i[1]] for i in upstream['bids']],
@@ -471,10 +571,12 @@ class KrakenNormalized(Kraken, NormalizedExchangeWrapper):
 
         return Decimal(ask) - Decimal(bid)
 
-    def get_market_depth(self, market):
-        '''return sum of all bids and asks'''
+    def get_market_depth(self, market, notional=None):
+        '''return sum of all bids and asks,
+        or of the levels worth <notional> on each side'''
 
-        order_book = self.get_market_orders(market, 1000)
+        order_book = self.get_market_orders(market, 1000, stream=True,
+                                            notional=notional)
 
         return {"bids": sum([Decimal(i[0]) * Decimal(i[1]) for i in order_book["bids"]]),
                 "asks": sum([Decimal(i[1]) for i in order_book["asks"]])
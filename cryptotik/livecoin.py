@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import requests
-from cryptotik.common import headers
+from cryptotik.common import headers, get_transport, decode, indexed
 from cryptotik.exceptions import APIError
 
 class Livecoin:
@@ -12,6 +12,7 @@ class Livecoin:
     headers = headers
 
     @classmethod
+    @indexed
     def format_pair(cls, pair):
         """format the pair argument to format understood by remote API."""
         pair = pair.replace("-", cls.delimiter).upper()
@@ -22,9 +23,9 @@ class Livecoin:
         '''call api'''
 
         try:
-            result = requests.get(url, headers=cls.headers, timeout=3)
+            result = get_transport().get(url, headers=cls.headers, timeout=3)
             assert result.status_code == 200
-            return result.json()
+            return decode(result)
         except requests.exceptions.RequestException as e:
             raise APIError(e)
 
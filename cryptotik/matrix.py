@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+'''cross exchange prices as arrays, requires numpy.
+
+    tickers = MultiExchange([...]).get_market_tickers(['eth-btc', 'ltc-btc'])
+    matrix = PriceMatrix(tickers)
+    matrix.best()['eth-btc']  # {'bid': 0.0301, 'bid_venue': 'kraken', ...}
+    matrix.opportunities(0.002)  # [('eth-btc', 'binance', 'kraken', 0.0031), ...]
+'''
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _price(value):
+    '''ticker price as float, nan where the exchange has none (None)'''
+
+    return np.nan if value is None else float(value)
+
+
+class PriceMatrix:
+    '''bids and asks of markets x exchanges, nan where exchange does not list the market.'''
+
+    def __init__(self, tickers):
+        '''<tickers>: dict of exchange: get_market_tickers() output'''
+
+        if np is None:
+            raise ImportError('PriceMatrix requires numpy, pip install numpy')
+
+        self.exchanges = list(tickers)
+        self.markets = sorted({m for i in tickers.values() for m in i})
+        index = {m: i for i, m in enumerate(self.markets)}
+
+        self.bids = np.full((len(self.markets), len(self.exchanges)), np.nan)
+        self.asks = np.full((len(self.markets), len(self.exchanges)), np.nan)
+
+        for column, exchange in enumerate(self.exchanges):
+            for market, ticker in tickers[exchange].items():
+                self.bids[index[market], column] = _price(ticker['bid'])
+                self.asks[index[market], column] = _price(ticker['ask'])
+
+    def best(self):
+        '''best bid and ask of every market and the exchanges quoting them,
+        price is nan and venue None where no exchange quotes that side'''
+
+        bid_venue = np.where(np.isnan(self.bids), -np.inf, self.bids).argmax(axis=1)
+        ask_venue = np.where(np.isnan(self.asks), np.inf, self.asks).argmin(axis=1)
+        rows = np.arange(len(self.markets))
+
+        bids = self.bids[rows, bid_venue].tolist()
+        asks = self.asks[rows, ask_venue].tolist()
+        bid_quoted = (~np.isnan(self.bids)).any(axis=1).tolist()
+        ask_quoted = (~np.isnan(self.asks)).any(axis=1).tolist()
+
+        return {market: {'bid': bids[i],
+                         'bid_venue': self.exchanges[bid_venue[i]] if bid_quoted[i] else None,
+                         'ask': asks[i],
+                         'ask_venue': self.exchanges[ask_venue[i]] if ask_quoted[i] else None}
+                for i, market in enumerate(self.markets)}
+
+    def spreads(self):
+        '''array of markets x exchanges x exchanges,
+        [m, i, j] is relative gain of buying market m at exchange i and selling at exchange j:
+        (bid at j - ask at i) / ask at i'''
+
+        asks = self.asks[:, :, np.newaxis]
+        bids = self.bids[:, np.newaxis, :]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (bids - asks) / asks
+
+    def opportunities(self, threshold=0):
+        '''list of (market, buy at, sell at, spread) with spread above <threshold>, best first'''
+
+        spreads = self.spreads()
+        found = np.argwhere(spreads > threshold)
+        found = found[np.argsort(-spreads[tuple(found.T)], kind='stable')]
+
+        return [(self.markets[m], self.exchanges[i], self.exchanges[j], float(spreads[m, i, j]))
+                for m, i, j in found]
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+'''run the same call on many exchange wrappers at once.
+
+    multi = MultiExchange([PoloniexNormalized(), BinanceNormalized(), KrakenNormalized()],
+                          timeout=5)
+    tickers = multi.get_market_ticker('eth-btc')
+    tickers['binance'], tickers.errors  # {'kraken': TimeoutError(), ...}
+'''
+
+import time
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class Results(dict):
+    '''results keyed by exchange name,
+    exchanges which failed or timed out are in <errors> instead.'''
+
+    def __init__(self, *args, **kwargs):
+
+        super(Results, self).__init__(*args, **kwargs)
+        self.errors = {}
+
+
+def _price(level):
+
+    return float(level[0])
+
+
+def _merge(books, side, depth):
+    '''k-way merge of one <side> of already sorted <books>, levels tagged with venue'''
+
+    levels = ([[i[0], i[1], venue] for i in book[side]] for venue, book in books.items())
+    merged = heapq.merge(*levels, key=_price, reverse=side == 'bids')
+
+    return list(itertools.islice(merged, depth))
+
+
+def consolidated_book(books, depth=None):
+    '''merge normalized order books of many exchanges into one.
+
+    <books>: dict of venue: get_market_orders() output, bids best (highest) first,
+             asks best (lowest) first, as every normalized wrapper returns them
+    <depth>: levels per side to keep, all of them when None
+    :return:
+        dict['bids': list[price, quantity, venue],
+             'asks': list[price, quantity, venue]]
+    '''
+
+    return {'bids': _merge(books, 'bids', depth),
+            'asks': _merge(books, 'asks', depth)}
+
+
+class MultiExchange:
+    '''calls a method of every wrapper concurrently, so total latency
+    is the one of the slowest exchange instead of the sum of all of them.'''
+
+    def __init__(self, exchanges, timeout=None, max_workers=None):
+        '''
+        <exchanges>: wrapper instances, names must be unique
+        <timeout>: seconds each exchange is given to answer, a number,
+                   or dict of exchange name: seconds, None is no limit
+        <max_workers>: threads, twice the number of exchanges by default
+        '''
+
+        self.exchanges = {i.name: i for i in exchanges}
+
+        if len(self.exchanges) != len(exchanges):
+            raise ValueError('Exchange names must be unique.')
+
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers or 2 * len(exchanges))
+
+    def __getattr__(self, name):
+        '''multi.<method>(*args) is multi.call(<method>, *args)'''
+
+        if name.startswith('_') or name in ('exchanges', 'executor'):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        return call
+
+    def _timeout(self, name):
+
+        if isinstance(self.timeout, dict):
+            return self.timeout.get(name)
+
+        return self.timeout
+
+    def call(self, method, *args, deadline=None, **kwargs):
+        '''call <method> with <args> on every exchange,
+        return Results once all of them answered, timed out
+        or <deadline> seconds passed, whichever comes first.'''
+
+        start = time.monotonic()
+        futures = {name: self.executor.submit(getattr(exchange, method), *args, **kwargs)
+                   for name, exchange in self.exchanges.items()}
+
+        def limit(name):
+            limits = [i for i in (self._timeout(name), deadline) if i is not None]
+            return min(limits) if limits else None
+
+        results = Results()
+
+        for name in sorted(futures, key=lambda i: (limit(i) is None, limit(i))):
+            future = futures[name]
+            wait = limit(name)
+
+            try:
+                if wait is None:
+                    results[name] = future.result()
+                else:
+                    results[name] = future.result(max(0, start + wait - time.monotonic()))
+            except TimeoutError as e:
+                future.cancel()  # thread can not be stopped, it's result is discarded
+                results.errors[name] = e
+            except Exception as e:
+                results.errors[name] = e
+
+        return results
+
+    def get_consolidated_book(self, market, depth=None, deadline=None):
+        '''order book of <market> across all exchanges, see consolidated_book,
+        exchanges which failed are in .errors of the result.'''
+
+        books = self.call('get_market_orders', market, deadline=deadline)
+        book = Results(consolidated_book(books, depth))
+        book.errors = books.errors
+
+        return book
+
+    def get_price_matrix(self, markets=None, deadline=None):
+        '''cryptotik.matrix.PriceMatrix of bulk tickers of all exchanges'''
+
+        from cryptotik.matrix import PriceMatrix
+
+        tickers = self.call('get_market_tickers', markets, deadline=deadline)
+        matrix = PriceMatrix(tickers)
+        matrix.errors = tickers.errors
+
+        return matrix
+
+    def close(self):
+        '''stop the worker threads'''
+
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+'''nonces for the private API calls
+
+Exchanges reject a nonce which is not greater than the previous one used
+with the same api key, so every thread and process using a key has to
+draw them from the same source.
+
+    ExchangeWrapper.nonce_provider = FileNonceProvider('/tmp/cryptotik.nonce')
+'''
+
+import os
+import json
+import time
+import threading
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+
+class NonceProvider:
+    '''strictly increasing nonces derived from unix time, safe across threads of one process.
+    Nonces are tracked per <scale> (time multiplier), as exchanges expect different ones.'''
+
+    def __init__(self):
+
+        self.last = {}
+        self.lock = threading.Lock()
+
+    def next(self, scale=1):
+        '''return a nonce greater than all previous ones of the same <scale>'''
+
+        with self.lock:
+            nonce = max(int(time.time() * scale), self.last.get(scale, 0) + 1)
+            self.last[scale] = nonce
+
+            return nonce
+
+
+class FileNonceProvider(NonceProvider):
+    '''nonces safe across processes of one host, last nonces are kept
+    in the file at <path> which is locked while a nonce is drawn.'''
+
+    def __init__(self, path):
+
+        if fcntl is None:
+            raise OSError('FileNonceProvider requires fcntl, which is not available on this platform.')
+
+        super(FileNonceProvider, self).__init__()
+        self.path = path
+
+    def next(self, scale=1):
+
+        with self.lock, os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), 'r+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)  # released when the file is closed
+
+            try:
+                last = json.loads(f.read() or '{}')
+            except ValueError:
+                last = {}
+
+            nonce = max(int(time.time() * scale), last.get(str(scale), 0) + 1)
+            last[str(scale)] = nonce
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(last))
+            f.flush()
+
+            return nonce
@@ -1,23 +1,31 @@
 # -*- coding: utf-8 -*-
 
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError,
                                   APIError,
                                   OutdatedBaseCurrenciesError)
 from cryptotik.common import is_sale
+from cryptotik.streaming import read_order_book
+from cryptotik.cache import Snapshot
 import datetime
 import time
+import functools
+import threading
+import logging
 import requests
-import hmac
 import hashlib
 from decimal import Decimal
 
+log = logging.getLogger(__name__)
+
 
 class Poloniex(ExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
 
         if apikey is not None and secret is not None:
             self.apikey = apikey.encode("utf-8")
@@ -32,15 +40,15 @@ class Poloniex(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        try:  # at Poloniex, fees may vary per user (https://poloniex.com/fees/)
-            self.taker_fee, self.maker_fee = self.get_fee_info()["takerFee"], self.get_fee_info()["makerFee"]
-        except:
-            self.taker_fee, self.maker_fee = "0.0025", "0.0015"
-
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
+        self.ticker_snapshot = Snapshot(lambda: self.api({"command": 'returnTicker'}),
+                                        self.snapshot_max_age)
+        self.volume_snapshot = Snapshot(lambda: self.api({"command": 'return24hVolume'}),
+                                        self.snapshot_max_age)
 
     name = 'poloniex'
     url = 'https://poloniex.com/'
+    digestmod = hashlib.sha512  # of the HMAC signing private calls
     public_commands = ('returnTicker', 'returnOrderBook', 'returnTradeHistory',
                        'returnChartData', 'return24hVolume', 'returnLoanOrders',
                        'returnCurrencies')
@@ -53,7 +61,7 @@ class Poloniex(ExchangeWrapper):
                         'returnOrderTrades', 'returnActiveLoans',
                         'returnLendingHistory', 'createLoanOffer',
                         'cancelLoanOffer', 'toggleAutoRenew', 'buy', 'sell',
-                        'cancelOrder', 'moveOrder', 'withdraw', 'returnFeeInfo',
+                        'cancelOrder', 'cancelAllOrders', 'moveOrder', 'withdraw', 'returnFeeInfo',
                         'transferBalance', 'returnMarginAccountSummary',
                         'marginBuy', 'marginSell', 'getMarginPosition',
                         'closeMarginPosition')
@@ -64,6 +72,62 @@ class Poloniex(ExchangeWrapper):
     headers = headers
     base_currencies = ['btc', 'eth', 'usdt', 'xmr']
     quote_order = 1
+    rate_limits = {'api': (6, 6)}  # 6 calls per second, public and private combined
+    cache_ttl = {'returnCurrencies': 300}
+    snapshot_max_age = 1  # seconds all market ticker and volume responses are reused for
+    fee_max_age = 3600  # seconds fee info is reused for, poloniex updates it daily
+    fee_retry_after = 60  # seconds a failed fee info request is not repeated for
+    default_fees = {'takerFee': '0.0025', 'makerFee': '0.0015'}
+    _fees = {}  # apikey: Snapshot of fee info, shared by instances using the same key
+    _fee_errors = {}  # apikey: (time.monotonic() of the failure, exception)
+    _fees_lock = threading.Lock()
+
+    def get_fees(self):
+        '''fee info of the api key, fetched on first use and shared by instances
+        using the same key, default fee schedule when there is no key.
+        A failed request is raised again for <fee_retry_after> seconds instead of being repeated.'''
+
+        apikey = getattr(self, 'apikey', None)
+        if apikey is None:
+            return self.default_fees
+
+        with self._fees_lock:
+            failed = self._fee_errors.get(apikey)
+            if failed is not None and time.monotonic() - failed[0] < self.fee_retry_after:
+                raise failed[1]
+
+            if apikey not in self._fees:
+                self._fees[apikey] = Snapshot(self.get_fee_info, self.fee_max_age)
+
+        try:
+            fees = self._fees[apikey].get()
+        except Exception as e:
+            with self._fees_lock:
+                self._fee_errors[apikey] = (time.monotonic(), e)
+            raise
+
+        self._fee_errors.pop(apikey, None)
+        return fees
+
+    def _fee(self, name):
+        '''<name> fee of get_fees(), the default one if fee info is unavailable'''
+
+        try:
+            return self.get_fees()[name]
+        except Exception as e:
+            log.warning('Poloniex fee info unavailable, using default %s: %r', name, e)
+            return self.default_fees[name]
+
+    @property
+    def taker_fee(self):
+        '''at Poloniex, fees may vary per user (https://poloniex.com/fees/)'''
+
+        return self._fee('takerFee')
+
+    @property
+    def maker_fee(self):
+
+        return self._fee('makerFee')
 
     def get_base_currencies(self):
         '''return base markets supported by this exchange.'''
@@ -79,13 +143,7 @@ class Poloniex(ExchangeWrapper):
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time() * 4000000010), nonce)
-        return self._nonce
+        return self._next_nonce(4000000010)
 
     @staticmethod
     def _subtract_one_month(t):
@@ -115,6 +173,7 @@ class Poloniex(ExchangeWrapper):
             return int(datetime.strftime('%s'))
 
     @classmethod
+    @indexed
     def format_pair(self, pair):
         '''formats pair string in format understood by remote API'''
 
@@ -126,23 +185,29 @@ class Poloniex(ExchangeWrapper):
 
         return pair
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
         '''verify if API responded properly and raise apropriate error.'''
 
         try:
-            if "error" in response.json().keys():
-                raise APIError(response.json()['error'])
+            if "error" in data.keys():
+                raise APIError(data['error'])
         except AttributeError:  # response has no error key
             pass
 
+    def _endpoint(self, params):
+
+        return params['command']
+
     def _generate_signature(self, pdata):
 
-        return hmac.new(self.secret, pdata, hashlib.sha512).hexdigest()
+        return self.signer.sign(pdata).hexdigest()
 
+    @public_call
     def api(self, params):
         '''API calls'''
 
         assert params["command"] in self.public_commands
+        self._throttle('api')
 
         try:
             response = self.api_session.get(self.url + "public?", params=params,
@@ -153,46 +218,47 @@ class Poloniex(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data)
+        return data
 
     def private_api(self, data):
         '''private API methods which require authentication'''
 
         assert data["command"] in self.private_commands
+        self._throttle('api')
 
         data["nonce"] = self.get_nonce()  # add nonce to post data
         pdata = requests.compat.urlencode(data).encode("utf-8")
-        self.headers.update(
-            {"Sign": self._generate_signature(pdata),
-             "Key": self.apikey
-             })
+        headers = dict(self.headers,  # copy, the class level dict is shared by all calls
+                       Sign=self._generate_signature(pdata),
+                       Key=self.apikey)
 
         try:
             response = self.api_session.post(self.url + "tradingApi", data=data,
-                                             headers=self.headers, timeout=self.timeout,
+                                             headers=headers, timeout=self.timeout,
                                              proxies=self.proxy)
             response.raise_for_status()
 
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(response)
-        return response.json()
+        data = decode(response)
+        self._verify_response(data)
+        return data
 
     def get_markets(self):
         '''return all supported markets.'''
 
-        return [i for i in self.api({"command": 'returnTicker', "currencyPair": 'all'})]
+        return list(self.ticker_snapshot.get())
 
     def get_market_ticker(self, pair):
         '''Returns the ticker for all markets'''
 
         if pair.lower() != "all":
-            return self.api({"command": 'returnTicker'})[self.format_pair(pair)]
+            return self.ticker_snapshot.get()[self.format_pair(pair)]
         else:
-            return self.api({"command": 'returnTicker',
-                            "currencyPair": pair.lower()})
+            return self.ticker_snapshot.get()
 
     def get_market_trade_history(self, pair, depth=200, since=None,
                                  until=int(time.time())):
@@ -290,13 +356,25 @@ class Poloniex(ExchangeWrapper):
                 "demands": sum([Decimal(i["amount"]) for i in loans["demands"]])
                 }
 
-    def get_market_orders(self, pair, depth=999999):
-        '''return order book for the market <pair>'''
+    def get_market_orders(self, pair, depth=999999, stream=False, notional=None):
+        '''return order book for the market <pair>
+
+        stream=True parses the order book while it is downloaded,
+        with <notional> it stops once the levels on each side are worth
+        <notional> (sum of price * amount) instead of reading all <depth> levels.'''
 
-        r = self.api({"command": "returnOrderBook",
-                     "currencyPair": self.format_pair(pair),
-                     "depth": depth
-                     })
+        params = {"command": "returnOrderBook",
+                  "currencyPair": self.format_pair(pair),
+                  "depth": depth
+                  }
+
+        if stream or notional is not None:
+            self._throttle('api')
+            r = read_order_book(self._stream(self.url + "public", params),
+                                depth, notional)
+            self._verify_response(r)
+        else:
+            r = self.api(params)
 
         return {k: v for k, v in r.items() if k in ['asks', 'bids']}
 
@@ -311,7 +389,7 @@ class Poloniex(ExchangeWrapper):
     def get_market_volume(self, pair=None):
         '''Returns the volume for past 24h'''
 
-        q = self.api({"command": 'return24hVolume'})
+        q = self.volume_snapshot.get()
 
         if pair:
             return q[self.format_pair(pair)]
@@ -425,13 +503,28 @@ class Poloniex(ExchangeWrapper):
                                        )
             return orders
 
-    def cancel_all_orders(self):
+    def cancel_all_orders(self, deadline=None):
+        '''cancel all open orders with a single cancelAllOrders request,
+        within <deadline> seconds if given. If it fails, open orders are listed
+        and cancelled one by one.
+        return dict of order number: True, or the exception which prevented it's cancel.'''
+
+        start = time.monotonic()
+        done = self._within(functools.partial(self.private_api, {'command': 'cancelAllOrders'}),
+                            deadline, start)
+
+        if not isinstance(done, Exception):
+            return dict.fromkeys(done.get('orderNumbers', []), True)
+
+        listed = self._within(self.get_open_orders, deadline, start)
 
-        orders = self.get_open_orders()
+        if isinstance(listed, Exception):
+            raise done
 
-        for i in orders.keys():
-            for order in orders[i]:
-                self.cancel_order(order['orderNumber'])
+        calls = {order['orderNumber']: functools.partial(self.cancel_order, order['orderNumber'])
+                 for i in listed.values() for order in i}
+
+        return self._cancel_each(calls, deadline, start)
 
     def get_order(self, order_id):
         '''get details about order'''
@@ -653,8 +746,9 @@ class Poloniex(ExchangeWrapper):
 
 class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
-        super(PoloniexNormalized, self).__init__(apikey, secret, timeout, proxy)
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
+        super(PoloniexNormalized, self).__init__(apikey, secret, timeout, proxy, transport)
 
     @staticmethod
     def _tstamp_to_datetime(timestamp):
@@ -669,6 +763,7 @@ class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
         return datetime.datetime.strptime(string, "%Y-%m-%d %H:%M:%S")
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -685,14 +780,6 @@ class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
 
         return base.upper() + self.delimiter + quote.upper()  # for poloniex quote comes second
 
-    @classmethod
-    def reverse_format_pair(self, market_pair: str) -> str:
-        """format the pair, but in reverse"""
-
-        base, quote = market_pair.split('_')
-
-        return base.lower() + "-" + quote.lower()
-
     @staticmethod
     def _format_interval(interval):
 
@@ -718,15 +805,33 @@ class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
 
         return m
 
-    def get_market_ticker(self, market):
-
-        ticker = super(PoloniexNormalized, self).get_market_ticker(market)
+    @staticmethod
+    def _normalize_ticker(ticker):
 
         return {'ask': float(ticker['lowestAsk']),
                 'bid': float(ticker['highestBid']),
                 'last': float(ticker['last'])
                 }
 
+    def get_market_ticker(self, market):
+
+        ticker = super(PoloniexNormalized, self).get_market_ticker(market)
+
+        return self._normalize_ticker(ticker)
+
+    def get_market_tickers(self, pairs=None):
+        '''tickers of <pairs>, all of them when None, in a single request'''
+
+        tickers = self.ticker_snapshot.get()
+
+        if pairs is None:
+            pairs = {i: '{1}-{0}'.format(*i.lower().split('_')) for i in tickers}
+        else:
+            pairs = {self.format_pair(i): i for i in pairs}
+
+        return {pair: self._normalize_ticker(tickers[symbol])
+                for symbol, pair in pairs.items() if symbol in tickers}
+
     def get_market_trade_history(self, market, depth=100):
 
         upstream = super(PoloniexNormalized, self).get_market_trade_history(market, depth)
@@ -744,7 +849,7 @@ class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
 
         return downstream
 
-    def get_market_orders(self, market, depth=100):
+    def get_market_orders(self, market, depth=100, stream=False, notional=None):
         '''
         :return:
             dict['bids': list[price, quantity],
@@ -753,7 +858,8 @@ class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
         bids[0] should be first next to the spread
         asks[0] should be first next to the spread
         '''
-        return super(PoloniexNormalized, self).get_market_orders(market, depth)
+        return super(PoloniexNormalized, self).get_market_orders(market, depth,
+                                                                 stream, notional)
 
     def get_market_sell_orders(self, market, depth=100):
         '''
@@ -769,10 +875,14 @@ class PoloniexNormalized(Poloniex, NormalizedExchangeWrapper):
         '''
         return super(PoloniexNormalized, self).get_market_orders(market, depth)['bids']
 
-    def get_market_depth(self, market):
-        '''return sum of all bids and asks'''
+    def get_market_depth(self, market, notional=None):
+        '''return sum of all bids and asks,
+        or of the levels worth <notional> on each side'''
 
-        order_book = self.get_market_orders(market)
+        if notional is not None:
+            order_book = self.get_market_orders(market, 999999, notional=notional)
+        else:
+            order_book = self.get_market_orders(market)
         return {"bids": sum([Decimal(i[0]) * Decimal(i[1]) for i in order_book["bids"]]),
                 "asks": sum([Decimal(i[1]) for i in order_book["asks"]])
                 }
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+'''client side rate limiting'''
+
+import time
+import threading
+
+
+class TokenBucket:
+    '''Token bucket holding up to <capacity> tokens, refilled at <rate> tokens per second.
+
+    Callers reserve tokens in the order they arrive and sleep until
+    the reservation is covered, so calls are queued rather than rejected.'''
+
+    def __init__(self, capacity, rate):
+
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def consume(self, tokens=1):
+        '''take <tokens> from the bucket, block until they are available.
+        returns number of seconds spent waiting.'''
+
+        with self.lock:
+            self._refill()
+            self.tokens -= min(tokens, self.capacity)
+            wait = max(0, -self.tokens / self.rate)
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
+
+    def pause(self, seconds):
+        '''empty the bucket so no tokens are handed out for <seconds>.'''
+
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(key, capacity, rate):
+    '''return bucket registered under <key>, create it if needed.
+    Buckets are shared by all wrapper instances using the same key.'''
+
+    with _buckets_lock:
+        try:
+            return _buckets[key]
+        except KeyError:
+            bucket = _buckets[key] = TokenBucket(capacity, rate)
+            return bucket
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+'''incremental parsing of order book responses
+
+Deep order books are megabytes of JSON, these helpers parse the bids/asks
+arrays level by level while the body is still arriving, so the caller
+can stop reading as soon as it has enough of the book.'''
+
+import json
+import codecs
+from cryptotik import common
+
+_decoder = json.JSONDecoder()
+_whitespace = ' \t\n\r,'
+
+
+def iter_levels(chunks, sides=('asks', 'bids'), skip=()):
+    '''parse the <sides> arrays of JSON order book from iterable of byte <chunks>,
+    yields (side, level) tuples in the order they appear in the document.
+
+    Levels of sides listed in <skip> are not parsed, the parser jumps
+    over them to the next side instead, <skip> may change while iterating.'''
+
+    text = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf, pos, side = '', 0, None
+    keys = {'"{}"'.format(s): s for s in sides}
+
+    def more():
+        '''append next chunk to the buffer, False when body is exhausted.'''
+
+        nonlocal buf
+        for chunk in chunks:
+            if chunk:
+                buf += text.decode(chunk)
+                return True
+        return False
+
+    while True:
+
+        if side is None:  # look for the next side
+            found = [(buf.find(k, pos), k) for k in keys if keys[k] not in skip]
+            found = [i for i in found if i[0] >= 0]
+
+            if not found:
+                buf, pos = buf[max(pos, len(buf) - 8):], 0  # key might be cut in half
+                if not more():
+                    return
+                continue
+
+            start, key = min(found)
+            start = buf.find('[', start)
+
+            if start < 0:
+                if not more():
+                    return
+                continue
+
+            side, pos = keys[key], start + 1
+            continue
+
+        while pos < len(buf) and buf[pos] in _whitespace:
+            pos += 1
+
+        if pos >= len(buf):
+            if not more():
+                return
+            continue
+
+        if buf[pos] == ']' or side in skip:  # end of the array, or caller had enough
+            side = None
+            continue
+
+        try:
+            level, pos = _decoder.raw_decode(buf, pos)
+        except ValueError:  # level is cut in half, wait for the rest of it
+            if not more():
+                raise
+            continue
+
+        if pos > 65536:  # drop what has been parsed already
+            buf, pos = buf[pos:], 0
+
+        yield side, level
+
+
+def read_order_book(chunks, depth=None, notional=None, sides=('asks', 'bids')):
+    '''read order book from iterable of byte <chunks>, stop reading once every side
+    has <depth> levels or levels worth <notional> (sum of price * quantity).
+
+    When the body holds no order book at all (exchange returned an error),
+    it is returned decoded so the caller can verify it as usual.'''
+
+    book = {}
+    totals = dict.fromkeys(sides, 0)
+    done = set()
+    body = []
+
+    def record(chunks):
+        for chunk in chunks:
+            if not book:  # keep the body until it is clear it is an order book
+                body.append(chunk)
+            yield chunk
+
+    for side, level in iter_levels(record(chunks), sides, skip=done):
+        levels = book.setdefault(side, [])
+        levels.append(level)
+
+        if depth is not None and len(levels) >= depth:
+            done.add(side)
+
+        if notional is not None:
+            totals[side] += float(level[0]) * float(level[1])
+            if totals[side] >= notional:
+                done.add(side)
+
+        if len(done) == len(sides):
+            break
+
+    if not book:
+        return common.json_loads(b''.join(body))  # decoder set by set_decoder()
+
+    for side in sides:
+        book.setdefault(side, [])
+
+    return book
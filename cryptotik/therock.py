@@ -1,11 +1,10 @@
 # -*- coding: utf-8 -*-
 
-import hmac
 import hashlib
-import time
 import requests
 from cryptotik.common import (headers, ExchangeWrapper,
-                              NormalizedExchangeWrapper)
+                              NormalizedExchangeWrapper, get_transport,
+                              decode, public_call, indexed)
 from cryptotik.exceptions import (InvalidBaseCurrencyError,
                                   InvalidDelimiterError,
                                   APIError,
@@ -19,13 +18,16 @@ from decimal import Decimal
 class TheRock(ExchangeWrapper):
 
     url = 'https://api.therocktrading.com/v1/'
+    digestmod = hashlib.sha512  # of the HMAC signing private calls
     name = 'therock'
     delimiter = ""
     headers = headers
     quote_order = 0
     base_currencies = ['eur', 'btc']
+    cache_ttl = {'funds': 300}
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
         '''initialize bittrex class'''
 
         if apikey and secret:
@@ -41,32 +43,32 @@ class TheRock(ExchangeWrapper):
         else:
             self.timeout = timeout
 
-        self.api_session = requests.Session()
+        self.api_session = transport or get_transport()
 
     def get_base_currencies(self):
         raise NotImplementedError
 
     @classmethod
+    @indexed
     def format_pair(self, pair):
         """format the pair argument to format understood by remote API."""
 
         return "".join(findall(r"[^\W\d_]+|\d+", pair)).upper()
 
-    def _verify_response(self, response):
+    def _verify_response(self, data):
         '''verify if API responded properly and raise apropriate error.'''
 
         try:
-            if 'errors' in response.json().keys():
-                raise APIError(response.json()['errors'][0]['message'])
+            if 'errors' in data.keys():
+                raise APIError(data['errors'][0]['message'])
         except KeyError:
             pass
 
     def _generate_signature(self, data):
 
-        return hmac.new(self.secret,
-                        data.encode("utf-8"),
-                        hashlib.sha512).hexdigest()
+        return self.signer.sign(data.encode("utf-8")).hexdigest()
 
+    @public_call
     def api(self, url):
         '''call api'''
 
@@ -79,8 +81,9 @@ class TheRock(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(result)
-        return result.json()
+        data = decode(result)
+        self._verify_response(data)
+        return data
 
     def private_api(self, url, http_method='GET', params={}):
         '''handles private api methods'''
@@ -106,8 +109,9 @@ class TheRock(ExchangeWrapper):
         except requests.exceptions.HTTPError as e:
             print(e)
 
-        self._verify_response(result)
-        return result.json()
+        data = decode(result)
+        self._verify_response(data)
+        return data
 
     def get_market_ticker(self, pair):
         '''returns simple current market status report'''
@@ -151,13 +155,7 @@ class TheRock(ExchangeWrapper):
     def get_nonce(self):
         '''return nonce integer'''
 
-        nonce = getattr(self, '_nonce', 0)
-        if nonce:
-            nonce += 1
-        # If the unix time is greater though, use that instead (helps low
-        # concurrency multi-threaded apps always call with the largest nonce).
-        self._nonce = max(int(time.time()), nonce)
-        return self._nonce
+        return self._next_nonce()
 
     def get_balances(self):
         """get all balances from your account"""
@@ -261,8 +259,9 @@ class TheRock(ExchangeWrapper):
 
 class TheRockNormalized(TheRock, NormalizedExchangeWrapper):
 
-    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None):
-        super(TheRockNormalized, self).__init__(apikey, secret, timeout, proxy)
+    def __init__(self, apikey=None, secret=None, timeout=None, proxy=None,
+                 transport=None):
+        super(TheRockNormalized, self).__init__(apikey, secret, timeout, proxy, transport)
 
     @staticmethod
     def _iso_to_datetime(iso):
@@ -271,6 +270,7 @@ class TheRockNormalized(TheRock, NormalizedExchangeWrapper):
         return dateutil.parser.parse(iso)
 
     @classmethod
+    @indexed
     def format_pair(self, market_pair):
         """
         Expected input is quote - base.
@@ -26,6 +26,8 @@ setup(name='cryptotik',
       author_email='peerchemist@protonmail.ch',
       license='BSD-3',
       packages=['cryptotik'],
+      python_requires='>=3.7',
       install_requires=['requests', 'python-dateutil'],
+      extras_require={'matrix': ['numpy']},
       tests_require=['pytest']
       )
@@ -0,0 +1,40 @@
+import asyncio
+from cryptotik.aio import AsyncBinanceNormalized, AsyncKraken, AsyncPoloniex
+
+
+def test_same_methods():
+    '''async class exposes the same public methods'''
+
+    assert hasattr(AsyncBinanceNormalized, 'get_market_ticker')
+    assert hasattr(AsyncBinanceNormalized, 'get_market_depth')
+    assert asyncio.iscoroutinefunction(AsyncBinanceNormalized.get_markets)
+    assert not asyncio.iscoroutinefunction(AsyncBinanceNormalized().format_pair)
+
+
+def test_attributes():
+    '''pure methods are forwarded, attributes and properties are not'''
+
+    binance = AsyncBinanceNormalized()
+
+    assert binance.format_pair('eth-btc') == 'ETHBTC'
+    assert binance.sync.name == 'binance'
+    assert not hasattr(binance, 'name')
+    assert not hasattr(AsyncPoloniex('key', 'secret'), 'taker_fee')  # would block on I/O
+    assert asyncio.iscoroutinefunction(AsyncPoloniex.get_fees)
+
+
+def test_get_markets():
+
+    kraken = AsyncKraken()
+    kraken.sync.api = lambda url, params=None: {'XXBTZEUR': {'altname': 'XBTEUR'}}
+
+    assert asyncio.run(kraken.get_markets()) == ['xbteur']
+
+
+def test_max_workers():
+    '''transport keeps as many connections open per host as there are threads'''
+
+    binance = AsyncBinanceNormalized(max_workers=50)
+
+    assert binance.executor._max_workers == 50
+    assert binance.sync.api_session.pool_maxsize == 50
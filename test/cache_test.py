@@ -0,0 +1,99 @@
+import time
+import itertools
+from cryptotik.cache import ResponseCache, DiskCache
+from cryptotik import Binance, Poloniex
+
+
+def test_ttl():
+
+    cache = ResponseCache()
+    cache.set('key', 1, 0.05)
+
+    assert cache.get('key') == (True, 1)
+    time.sleep(0.06)
+    assert cache.get('key') == (False, None)
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_lru():
+    '''least recently used entry is evicted first'''
+
+    cache = ResponseCache(maxsize=2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    cache.get('a')
+    cache.set('c', 3, 60)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.get('c') == (True, 3)
+
+
+def test_cached_endpoint(exchange):
+    '''endpoints listed in cache_ttl are answered from the cache, others are not'''
+
+    served = itertools.count()
+    binance = exchange(Binance, lambda *args: {'symbols': [], 'serverTime': next(served)})
+    binance.cache = ResponseCache()
+
+    assert binance.get_exchange_information() == binance.get_exchange_information()
+
+    ticker = binance.url + 'api/v1/ticker/24hr'
+    assert binance.api(ticker, params={}) != binance.api(ticker, params={})
+
+    assert Poloniex()._cache_ttl({'command': 'returnCurrencies'}) == 300
+    assert Poloniex()._cache_ttl({'command': 'returnTicker'}) is None
+
+
+def test_disk_cache(exchange, tmp_path):
+    '''restarted process is answered from disk while the exchange is unreachable'''
+
+    def unreachable(*args):
+        raise ConnectionError('offline')
+
+    binance = exchange(Binance, b'{"symbols": [{"symbol": "ETHBTC"}]}')
+    binance.disk_cache = DiskCache(str(tmp_path))
+    binance.get_exchange_information()
+
+    restarted = exchange(Binance, unreachable)
+    restarted.disk_cache = DiskCache(str(tmp_path))
+
+    assert restarted.get_exchange_information() == {'symbols': [{'symbol': 'ETHBTC'}]}
+
+
+def test_disk_entry_lifetime(exchange, tmp_path):
+    '''entry read from disk is kept in memory only for the rest of it's lifetime'''
+
+    binance = exchange(Binance, b'{"symbols": []}')
+    binance.disk_cache = DiskCache(str(tmp_path))
+    binance.cache_ttl = {'api/v1/exchangeInfo': 0.2}
+    binance.get_exchange_information()
+
+    time.sleep(0.15)
+    binance.cache = ResponseCache()
+    binance.get_exchange_information()  # from disk, 0.05 seconds left
+    time.sleep(0.07)
+    binance.get_exchange_information()
+
+    assert binance.cache.stats()['hits'] == 0  # expired in memory together with the disk entry
+
+
+def test_stale_while_revalidate(tmp_path):
+
+    cache = DiskCache(str(tmp_path))
+    cache.set('key', 'old')
+    done = []
+
+    def fetch():
+        done.append(1)
+        return 'new'
+
+    value, age = cache.fetch('key', 0, fetch)
+    assert value == 'old' and age >= 0
+
+    for _ in range(100):
+        if cache.get('key')[1] == 'new':
+            break
+        time.sleep(0.01)
+
+    assert cache.get('key')[1] == 'new' and done == [1]
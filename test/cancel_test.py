@@ -0,0 +1,163 @@
+import time
+import pytest
+from cryptotik import Binance, Bittrex, Poloniex, Kraken
+from cryptotik.exceptions import APIError
+
+
+def test_binance_oco(exchange):
+    '''orders of an OCO list are reported from it's orderReports'''
+
+    def answer(method, url, kwargs):
+        if method == 'GET':
+            return [{'symbol': 'ETHBTC', 'orderId': 1, 'orderListId': -1},
+                    {'symbol': 'ETHBTC', 'orderId': 2, 'orderListId': 7},
+                    {'symbol': 'ETHBTC', 'orderId': 3, 'orderListId': 7},
+                    {'symbol': 'LTCBTC', 'orderId': 4, 'orderListId': -1}]
+        if 'ETHBTC' in url:
+            return [{'symbol': 'ETHBTC', 'orderId': 1},
+                    {'orderListId': 7, 'contingencyType': 'OCO',
+                     'orderReports': [{'symbol': 'ETHBTC', 'orderId': 2},
+                                      {'symbol': 'ETHBTC', 'orderId': 3}]}]
+        return []
+
+    binance = exchange(Binance, answer, 'key', 'secret')
+
+    results = binance.cancel_all_orders()
+
+    assert results[1] is results[2] is results[3] is True
+    assert isinstance(results[4], APIError)  # not in the response of it's symbol
+
+
+def test_binance_symbol_fallback(exchange):
+    '''orders of a symbol the bulk cancel failed for are cancelled one by one'''
+
+    def answer(method, url, kwargs):
+        if method == 'GET':
+            return [{'symbol': 'ETHBTC', 'orderId': 1}, {'symbol': 'ETHBTC', 'orderId': 2}]
+        if 'openOrders' in url:
+            return {'code': -1003, 'msg': 'Too many requests.'}
+        return {'symbol': 'ETHBTC', 'orderId': 1 if 'orderId=1' in url else 2}
+
+    binance = exchange(Binance, answer, 'key', 'secret')
+
+    assert binance.cancel_all_orders() == {1: True, 2: True}
+
+
+def test_bittrex_deadline(exchange):
+    '''cancels which do not finish within the deadline are reported as TimeoutError'''
+
+    def answer(method, url, kwargs):
+        if 'cancel' in url:
+            time.sleep(0.3)
+        return {'success': True, 'result': [{'OrderUuid': 'a'}, {'OrderUuid': 'b'}]}
+
+    bittrex = exchange(Bittrex, answer, 'key', 'secret')
+
+    start = time.monotonic()
+    results = bittrex.cancel_all_orders(deadline=0.1)
+
+    assert time.monotonic() - start < 0.25
+    assert all(isinstance(results[i], TimeoutError) for i in 'ab')
+
+
+def test_bittrex_unlisted(exchange):
+
+    bittrex = exchange(Bittrex, {'success': False, 'message': 'APIKEY_INVALID'}, 'key', 'secret')
+
+    with pytest.raises(APIError):
+        bittrex.cancel_all_orders()
+
+
+def test_poloniex_bulk(exchange):
+    '''cancelled orders are taken from the cancelAllOrders response, nothing is listed'''
+
+    polo = exchange(Poloniex, {'success': 1, 'orderNumbers': [1, 2]}, 'key', 'secret')
+
+    assert polo.cancel_all_orders() == {1: True, 2: True}
+
+
+def test_poloniex_fallback(exchange):
+    '''open orders are cancelled one by one if cancelAllOrders fails,
+    a refused cancel is retried once'''
+
+    refused = set()
+
+    def answer(method, url, kwargs):
+        data = kwargs['data']
+        if data['command'] == 'cancelAllOrders':
+            return {'error': 'Nonce must be greater than 1.'}
+        if data['command'] == 'returnOpenOrders':
+            return {'BTC_ETH': [{'orderNumber': '1'}, {'orderNumber': '2'}], 'BTC_LTC': []}
+        if data['orderNumber'] == '2':
+            return {'error': 'Invalid order number, or you are not the person who placed the order.'}
+        if data['orderNumber'] not in refused:
+            refused.add(data['orderNumber'])
+            return {'error': 'Nonce must be greater than 1.'}
+        return {'success': 1}
+
+    polo = exchange(Poloniex, answer, 'key', 'secret')
+
+    results = polo.cancel_all_orders()
+
+    assert results['1'] is True and isinstance(results['2'], APIError)
+
+
+def test_poloniex_failed(exchange):
+    '''raise if orders can neither be cancelled at once nor listed'''
+
+    polo = exchange(Poloniex, {'error': 'Nonce must be greater than 1.'}, 'key', 'secret')
+
+    with pytest.raises(APIError):
+        polo.cancel_all_orders()
+
+
+@pytest.fixture
+def kraken(exchange):
+    '''Kraken answering private calls from a dict of endpoint: result or error list'''
+
+    def build(answers):
+
+        def answer(method, url, kwargs):
+            result = answers[url.rsplit('/', 1)[1]]
+            if callable(result):
+                result = result(kwargs['data'])
+            if isinstance(result, list):
+                return {'error': result}
+            return {'error': [], 'result': result}
+
+        return exchange(Kraken, answer, 'key', 'c2VjcmV0')
+
+    return build
+
+
+def test_kraken_reports_listed(kraken):
+    '''result holds the orders open before CancelAll'''
+
+    kraken = kraken({'OpenOrders': {'open': {'A': {}, 'B': {}}}, 'CancelAll': {'count': 2}})
+
+    assert kraken.cancel_all_orders() == {'A': True, 'B': True}
+
+
+def test_kraken_unlisted(kraken):
+    '''CancelAll is sent even if the orders can not be listed, nothing is reported'''
+
+    sent = []
+
+    def cancel(data):
+        sent.append(data)
+        return {'count': 3}
+
+    kraken = kraken({'OpenOrders': ['EAPI:Rate limit exceeded'], 'CancelAll': cancel})
+
+    assert kraken.cancel_all_orders() == {}
+    assert len(sent) == 1
+
+
+def test_kraken_fallback(kraken):
+    '''listed orders are cancelled one by one if CancelAll fails'''
+
+    kraken = kraken({'OpenOrders': {'open': {'A': {}, 'B': {}}},
+                     'CancelAll': ['EGeneral:Internal error'],
+                     'CancelOrder': lambda data: {'count': 1}})
+
+    assert kraken.cancel_all_orders() == {'A': True, 'B': True}
@@ -0,0 +1,136 @@
+import pytest
+import json
+import time
+import itertools
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from cryptotik.common import (HTTPTransport, get_transport, headers,
+                              set_decoder, json_loads, SingleFlight)
+from cryptotik.exceptions import APIError
+from cryptotik import Binance, Kraken
+
+
+def test_shared_transport():
+    '''wrappers share the default transport'''
+
+    assert Binance().api_session is get_transport()
+    assert Kraken().api_session is Binance().api_session
+
+
+def test_pool_size():
+
+    transport = HTTPTransport(pool_maxsize=50)
+    transport.limit_host('api.binance.com', 5)
+
+    assert transport.backend.get_adapter('https://api.kraken.com/0/')._pool_maxsize == 50
+    assert transport.backend.get_adapter('https://api.binance.com/api')._pool_maxsize == 5
+
+
+def test_backend(backend):
+
+    backend = backend()
+    transport = HTTPTransport(keep_alive=False, backend=backend)
+    transport.get('https://api.kraken.com/0/', headers={'Accept': 'application/json'})
+
+    method, url, kwargs = backend.sent[0]
+    assert method == 'GET'
+    assert kwargs['headers'] == {'Accept': 'application/json', 'Connection': 'close'}
+
+
+def test_compression(backend):
+
+    backend = backend()
+    HTTPTransport(compression=True, backend=backend).get('https://poloniex.com/public',
+                                                        headers=headers)
+
+    assert 'gzip' in backend.sent[0][2]['headers']['Accept-Encoding']
+    assert headers['Accept-Encoding'] == 'identity'  # shared headers are left alone
+
+
+def test_decode_once(exchange):
+
+    calls = []
+
+    def loads(body):
+        calls.append(body)
+        return json.loads(body)
+
+    set_decoder(loads)
+    try:
+        kraken = exchange(Kraken, b'{"error": [], "result": {"a": 1}}')
+        assert kraken.api(kraken.url + 'public/Time') == {'a': 1}
+    finally:
+        set_decoder(json_loads)
+
+    assert len(calls) == 1
+
+
+def test_verify_response(exchange):
+
+    kraken = exchange(Kraken, b'{"error": ["EGeneral:Invalid arguments"]}')
+
+    with pytest.raises(APIError):
+        kraken.api(kraken.url + 'public/Depth')
+
+
+def test_coalesce(exchange):
+    '''concurrent identical calls share a single request and it's result'''
+
+    served = itertools.count()
+    binance = exchange(Binance, lambda *args: {'bids': [], 'asks': [], 'lastUpdateId': next(served)},
+                       delay=0.05)
+    binance.coalesce = True
+
+    with ThreadPoolExecutor(8) as pool:
+        books = list(pool.map(lambda i: binance.get_market_orders('ethbtc'), range(8)))
+
+    assert all(i is books[0] for i in books)
+    assert binance.get_market_orders('ethbtc') != books[0]  # call is over, next one is new
+
+
+def test_coalesce_error():
+
+    def fail():
+        time.sleep(0.05)
+        raise APIError('failed')
+
+    flights = SingleFlight()
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flights.do, 'key', fail) for _ in range(4)]
+
+    assert all(isinstance(i.exception(), APIError) for i in futures)
+
+
+def test_lazy_import():
+    '''importing the package does not import the exchange modules'''
+
+    import subprocess
+    import sys
+
+    code = 'import sys, cryptotik; print(sorted(m for m in sys.modules if m.startswith("cryptotik")))'
+    loaded = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', code])
+
+    assert loaded.strip() == b"['cryptotik']"
+
+
+def test_concurrent_signing(exchange):
+    '''concurrent private calls each send their own signature'''
+
+    import hmac
+    import hashlib
+    from cryptotik import Poloniex
+
+    polo = exchange(Poloniex, b'{}', 'key', 'secret', delay=0.05)
+    shared = dict(headers)
+
+    with ThreadPoolExecutor(32) as pool:
+        list(pool.map(lambda i: polo.get_balances(), range(64)))
+
+    sent = polo.api_session.backend.sent
+    assert len(sent) == 64
+    for method, url, kwargs in sent:
+        body = requests.compat.urlencode(kwargs['data']).encode()
+        assert kwargs['headers']['Sign'] == hmac.new(b'secret', body, hashlib.sha512).hexdigest()
+
+    assert headers == shared  # shared headers are not modified
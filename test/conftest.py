@@ -1,3 +1,56 @@
+import io
+import json
+import time
+import pytest
+import requests
+from cryptotik.common import HTTPTransport
+
+
+class FakeBackend:
+    '''records requests instead of sending them, answers them after <delay> seconds
+    with <answer>, the response body, or answer(method, url, kwargs) if it is callable.
+    Bodies which are not bytes are encoded as JSON.'''
+
+    def __init__(self, answer=b'{}', delay=0):
+        self.sent = []
+        self.answer = answer
+        self.delay = delay
+
+    def request(self, method, url, **kwargs):
+        self.sent.append((method, url, kwargs))
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        body = self.answer(method, url, kwargs) if callable(self.answer) else self.answer
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        response.raw = io.BytesIO(response._content)  # read by streamed requests
+        return response
+
+
+@pytest.fixture
+def backend():
+    '''FakeBackend factory, backend(answer) -> FakeBackend'''
+
+    return FakeBackend
+
+
+@pytest.fixture
+def exchange():
+    '''exchange(cls, answer, *args) -> instance of wrapper <cls> answered by a FakeBackend
+    (wrapper.api_session.backend), without client side rate limiting.'''
+
+    def build(cls, answer=b'{}', *args, delay=0, **kwargs):
+        wrapper = cls(*args, transport=HTTPTransport(backend=FakeBackend(answer, delay)), **kwargs)
+        wrapper.throttled = False
+        return wrapper
+
+    return build
+
 
 def pytest_addoption(parser):
     parser.addoption("--apikey", action="store",
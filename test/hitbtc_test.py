@@ -96,4 +96,4 @@ def test_cancel_order(apikey, secret):
 
 
     with pytest.raises(APIError):
-        hit.cancel_order('invalid')
\ No newline at end of file
+        hit.cancel_order('invalid')
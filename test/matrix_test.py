@@ -0,0 +1,55 @@
+import pytest
+from cryptotik.multi import MultiExchange
+
+np = pytest.importorskip('numpy')
+from cryptotik.matrix import PriceMatrix
+
+tickers = {'binance': {'eth-btc': {'bid': '0.0300', 'ask': '0.0301', 'last': '0.03'},
+                       'ltc-btc': {'bid': '0.0100', 'ask': '0.0101', 'last': '0.01'}},
+           'kraken': {'eth-btc': {'bid': '0.0305', 'ask': '0.0306', 'last': '0.03'}},
+           'bittrex': {'eth-btc': {'bid': 0.0299, 'ask': 0.0302, 'last': 0.03},
+                       'ltc-btc': {'bid': 0.0099, 'ask': 0.0100, 'last': 0.01}}}
+
+
+def test_best():
+
+    best = PriceMatrix(tickers).best()
+
+    assert best['eth-btc'] == {'bid': 0.0305, 'bid_venue': 'kraken',
+                               'ask': 0.0301, 'ask_venue': 'binance'}
+    assert best['ltc-btc']['ask_venue'] == 'bittrex'
+
+
+def test_unquoted():
+    '''None prices (bittrex markets without orders) are nan, without a venue'''
+
+    best = PriceMatrix({'bittrex': {'xyz-btc': {'bid': None, 'ask': None, 'last': None}},
+                        'binance': {'xyz-btc': {'bid': None, 'ask': '0.5', 'last': '0.5'}}}).best()
+
+    assert np.isnan(best['xyz-btc']['bid']) and best['xyz-btc']['bid_venue'] is None
+    assert best['xyz-btc']['ask'] == 0.5 and best['xyz-btc']['ask_venue'] == 'binance'
+
+
+def test_opportunities():
+
+    matrix = PriceMatrix(tickers)
+    found = matrix.opportunities()
+
+    assert [i[:3] for i in found] == [('eth-btc', 'binance', 'kraken'),
+                                     ('eth-btc', 'bittrex', 'kraken')]
+    assert found[0][3] == pytest.approx((0.0305 - 0.0301) / 0.0301)
+    assert np.isnan(matrix.spreads()[matrix.markets.index('ltc-btc'), 1, 0])
+
+
+def test_from_multi_exchange():
+
+    class Exchange:
+        def __init__(self, name):
+            self.name = name
+
+        def get_market_tickers(self, pairs=None):
+            return tickers[self.name]
+
+    matrix = MultiExchange([Exchange(i) for i in tickers]).get_price_matrix()
+
+    assert matrix.bids.shape == (2, 3) and matrix.errors == {}
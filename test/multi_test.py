@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import TimeoutError
+from cryptotik.multi import MultiExchange, consolidated_book
+from cryptotik.exceptions import APIError
+
+
+class Exchange:
+    '''stands in for a normalized wrapper'''
+
+    def __init__(self, name, delay=0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+
+    def get_market_ticker(self, market):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {'market': market, 'exchange': self.name}
+
+
+def test_concurrent():
+    '''latency is the one of the slowest exchange'''
+
+    multi = MultiExchange([Exchange(i, 0.1) for i in ('a', 'b', 'c', 'd')])
+    start = time.monotonic()
+    r = multi.get_market_ticker('eth-btc')
+
+    assert time.monotonic() - start < 0.3
+    assert r['c'] == {'market': 'eth-btc', 'exchange': 'c'}
+    assert r.errors == {}
+
+
+def test_partial_results():
+
+    multi = MultiExchange([Exchange('ok'), Exchange('slow', 1), Exchange('broken', error=APIError('down'))],
+                          timeout={'slow': 0.05})
+    r = multi.call('get_market_ticker', 'eth-btc')
+
+    assert list(r) == ['ok']
+    assert isinstance(r.errors['slow'], TimeoutError)
+    assert isinstance(r.errors['broken'], APIError)
+
+
+def test_deadline():
+
+    multi = MultiExchange([Exchange('a', 0.01), Exchange('b', 1)], timeout=5)
+    start = time.monotonic()
+    r = multi.get_market_ticker('eth-btc', deadline=0.1)
+
+    assert time.monotonic() - start < 0.5
+    assert 'a' in r and 'b' in r.errors
+
+
+def test_consolidated_book():
+
+    books = {'binance': {'bids': [['0.0300', 1], ['0.0298', 2]],
+                         'asks': [['0.0302', 1], ['0.0305', 2]]},
+             'kraken': {'bids': [[0.0301, 3], [0.0297, 1]],
+                        'asks': [[0.0303, 1]]},
+             'bittrex': {'bids': [], 'asks': []}}
+
+    book = consolidated_book(books, depth=3)
+
+    assert book['bids'] == [[0.0301, 3, 'kraken'], ['0.0300', 1, 'binance'], ['0.0298', 2, 'binance']]
+    assert book['asks'] == [['0.0302', 1, 'binance'], [0.0303, 1, 'kraken'], ['0.0305', 2, 'binance']]
@@ -0,0 +1,54 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from cryptotik.nonce import NonceProvider, FileNonceProvider
+from cryptotik import Poloniex, Kraken
+
+
+def test_threads():
+
+    provider = NonceProvider()
+
+    with ThreadPoolExecutor(8) as pool:
+        nonces = list(pool.map(lambda i: provider.next(), range(1000)))
+
+    assert len(set(nonces)) == 1000
+
+
+def test_scales():
+    '''nonces of different scales are tracked separately'''
+
+    provider = NonceProvider()
+    seconds = provider.next()
+
+    assert provider.next(1000) > seconds * 1000 - 1000
+    assert provider.next() == seconds + 1
+
+
+def draw(path, queue):
+
+    provider = FileNonceProvider(path)
+    queue.put([provider.next() for _ in range(100)])
+
+
+def test_processes(tmp_path):
+
+    path = str(tmp_path / 'nonce')
+    queue = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=draw, args=(path, queue)) for _ in range(4)]
+
+    for i in workers:
+        i.start()
+    nonces = sum((queue.get(timeout=30) for _ in workers), [])
+    for i in workers:
+        i.join()
+
+    assert len(set(nonces)) == 400
+
+
+def test_shared_by_wrappers():
+    '''instances using the same key draw from one provider'''
+
+    a, b = Poloniex(), Poloniex()
+
+    assert len({a.get_nonce() if i % 2 else b.get_nonce() for i in range(100)}) == 100
+    assert Kraken().get_nonce() < Poloniex().get_nonce()
@@ -0,0 +1,107 @@
+import time
+import hmac
+import hashlib
+import logging
+import pytest
+from cryptotik import Poloniex, Kraken
+from cryptotik.bitmex import Bitmex
+
+
+def test_fees(exchange):
+    '''fee info is fetched on first use, once per api key'''
+
+    polo = exchange(Poloniex, b'{"makerFee": "0.0010", "takerFee": "0.0020"}', 'fees', 'secret')
+
+    assert polo.get_fees() == {'makerFee': '0.0010', 'takerFee': '0.0020'}
+    assert polo.taker_fee == '0.0020' and polo.maker_fee == '0.0010'
+
+    def unreachable(*args):
+        raise ConnectionError('offline')
+
+    assert exchange(Poloniex, unreachable, 'fees', 'secret').maker_fee == '0.0010'
+    assert Poloniex().get_fees() == Poloniex.default_fees
+
+
+def test_fees_unavailable(exchange, caplog):
+    '''fee properties fall back to the default fees, failed request is not repeated right away'''
+
+    sent = []
+
+    def unreachable(*args):
+        sent.append(args)
+        raise ConnectionError('offline')
+
+    polo = exchange(Poloniex, unreachable, 'no fees', 'secret')
+
+    with caplog.at_level(logging.WARNING, logger='cryptotik.poloniex'):
+        assert polo.taker_fee == Poloniex.default_fees['takerFee']
+        assert polo.maker_fee == Poloniex.default_fees['makerFee']
+
+    assert len(sent) == 1
+    assert 'fee info unavailable' in caplog.text
+
+    try:
+        polo.get_fees()
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError('failure is not raised by get_fees')
+
+
+def test_fees_retried(exchange):
+    '''failed fee info request is repeated once fee_retry_after has passed'''
+
+    answers = [ConnectionError('offline'), {'makerFee': '0.0010', 'takerFee': '0.0020'}]
+
+    def answer(*args):
+        served = answers.pop(0)
+        if isinstance(served, Exception):
+            raise served
+        return served
+
+    polo = exchange(Poloniex, answer, 'retried fees', 'secret')
+    polo.fee_retry_after = 0.05
+
+    assert polo.taker_fee == Poloniex.default_fees['takerFee']
+    time.sleep(0.06)
+    assert polo.taker_fee == '0.0020'
+
+
+def test_deposit_methods(exchange):
+    '''deposit methods are cached per api key and asset, addresses and history use the cached method'''
+
+    methods = {'XBT': 'Bitcoin', 'ETH': 'Ether (Hex)'}
+
+    def answer(method, url, kwargs):
+        data = kwargs['data']
+        return {'error': [], 'result': {
+            'DepositMethods': lambda: [{'method': methods[data['asset']]}],
+            'DepositAddresses': lambda: [{'address': data['method'] + ' address'}],
+            'DepositStatus': lambda: [{'method': data['method']}]
+        }[url.rsplit('/', 1)[1]]()}
+
+    kraken = exchange(Kraken, answer, 'deposits', 'c2VjcmV0')
+
+    assert kraken.prefetch_deposit_methods(['xbt', 'eth']) == {'xbt': 'Bitcoin', 'eth': 'Ether (Hex)'}
+
+    methods.clear()  # any further DepositMethods request fails
+    assert kraken.get_deposit_address('xbt') == 'Bitcoin address'
+    assert kraken.get_deposit_history('eth') == [{'method': 'Ether (Hex)'}]
+    assert exchange(Kraken, answer, 'deposits', 'c2VjcmV0').get_deposit_method('eth') == 'Ether (Hex)'
+
+
+def test_signer_follows_secret():
+    '''secret set after construction is used for signing, replacing it rebuilds the signer'''
+
+    bitmex = Bitmex()
+
+    for secret in ("chNOOS4KvNXR_Xq4k4c9qsfoKWvnDecLATCRlcBwyKDYnWgO", "another secret"):
+        bitmex.secret = secret
+        expected = hmac.new(secret.encode(), b'POST/order1518064238{}', hashlib.sha256).hexdigest()
+        assert bitmex._generate_signature("/order", {}, 1518064238, 'POST') == expected
+
+
+def test_signer_without_secret():
+
+    with pytest.raises(ValueError):
+        Poloniex()._generate_signature(b'command=returnBalances')
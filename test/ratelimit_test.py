@@ -0,0 +1,49 @@
+import time
+from cryptotik.ratelimit import TokenBucket
+from cryptotik import Binance, Poloniex
+
+
+def test_burst():
+    '''calls within capacity do not wait'''
+
+    bucket = TokenBucket(5, 100)
+
+    assert sum(bucket.consume() for _ in range(5)) == 0
+
+
+def test_queue():
+    '''calls over capacity are queued, not rejected'''
+
+    bucket = TokenBucket(1, 50)
+    start = time.monotonic()
+
+    for _ in range(6):
+        bucket.consume()
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_pause():
+
+    bucket = TokenBucket(10, 100)
+    bucket.pause(0.05)
+
+    assert bucket.consume() > 0.04
+
+
+def test_binance_weight():
+
+    assert Binance._weight(Binance.url + 'api/v1/depth', {'limit': 1000}) == 10
+    assert Binance._weight(Binance.url + 'api/v1/ticker/24hr', ()) == 40
+    assert Binance._weight(Binance.url + 'api/v1/ticker/24hr', (('symbol', 'ETHBTC'),)) == 1
+
+
+def test_shared_budget():
+    '''instances of the same exchange share the budget'''
+
+    scope = 'test-{}'.format(id(test_shared_budget))  # bucket of it's own, real ones are untouched
+    first, second = Poloniex(), Poloniex()
+    first.rate_limits = second.rate_limits = {scope: (2, 20)}
+
+    assert first._throttle(scope) + first._throttle(scope) == 0
+    assert second._throttle(scope) > 0.03
@@ -0,0 +1,53 @@
+import itertools
+from cryptotik import Poloniex
+from cryptotik.bitmex import Bitmex
+from cryptotik.coinmarketcap import CoinMarketCap
+
+
+def test_poloniex_tickers(exchange):
+    '''lookups of single pairs are served from one all market response until it is invalidated'''
+
+    served = itertools.count()
+    polo = exchange(Poloniex, lambda *args: {'BTC_ETH': {'last': '0.03', 'id': next(served)},
+                                             'BTC_LTC': {'last': '0.01'}})
+
+    assert polo.get_market_ticker('btc-eth') == {'last': '0.03', 'id': 0}
+    assert polo.get_market_ticker('btc_ltc') == {'last': '0.01'}
+    assert polo.get_markets() == ['BTC_ETH', 'BTC_LTC']
+    assert polo.get_market_ticker('btc-eth')['id'] == 0
+
+    polo.ticker_snapshot.invalidate()
+    assert polo.get_market_ticker('btc-eth')['id'] == 1
+
+
+def test_bitmex_instruments(exchange):
+    '''tickers, volumes and markets are looked up in one active instruments response'''
+
+    served = itertools.count()
+    instrument = {'symbol': 'XBTUSD', 'lastPrice': 6500, 'lastChangePcnt': 0,
+                  'lastTickDirection': 'PlusTick', 'lowPrice': 6400, 'prevClosePrice': 6450,
+                  'timestamp': '2018-07-01T00:00:00.000Z', 'volume24h': 1000, 'vwap': 6480}
+    bitmex = exchange(Bitmex, lambda *args: [dict(instrument, lastPrice=next(served)),
+                                             dict(instrument, symbol='ETHXBT')])
+
+    assert bitmex.get_market_ticker('xbtusd')['lastPrice'] == 0
+    assert bitmex.get_market_volume('ethxbt') == 1000
+    assert bitmex.get_markets() == ['XBTUSD', 'ETHXBT']
+    assert bitmex.get_market_ticker('xbtusd')['lastPrice'] == 0
+
+
+def test_coinmarketcap_table(exchange):
+    '''coins are looked up by symbol or id in a table of each convert currency'''
+
+    def answer(method, url, kwargs):
+        currency = url.split('convert=')[1] if 'convert=' in url else 'USD'
+        return [{'id': 'bitcoin', 'symbol': 'BTC', 'price': currency},
+                {'id': 'peercoin', 'symbol': 'PPC', 'price': currency}]
+
+    mcap = exchange(CoinMarketCap, answer)
+
+    assert mcap.get_ticker('ppc') == [{'id': 'peercoin', 'symbol': 'PPC', 'price': 'USD'}]
+    assert mcap.get_ticker('bitcoin')[0]['symbol'] == 'BTC'
+    assert mcap.get_ticker('xyz') == []
+    assert len(mcap.get_ticker()) == 2
+    assert mcap.get_ticker('btc', 'eur')[0]['price'] == 'EUR'
@@ -0,0 +1,120 @@
+import json
+from cryptotik.streaming import iter_levels, read_order_book
+
+book = {'asks': [['0.0301', 2.5], ['0.0302', 1.0], ['0.0303', 4.0]],
+        'bids': [['0.0300', 1.5], ['0.0299', 3.0]],
+        'isFrozen': '0', 'seq': 1}
+
+
+def chunked(payload, size=7):
+    '''split JSON <payload> in chunks of <size> bytes, mimics a slow download'''
+
+    body = json.dumps(payload).encode()
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def test_iter_levels():
+
+    levels = list(iter_levels(chunked(book)))
+
+    assert [i for s, i in levels if s == 'asks'] == book['asks']
+    assert [i for s, i in levels if s == 'bids'] == book['bids']
+
+
+def test_full_book():
+
+    assert read_order_book(chunked(book, 3)) == {'asks': book['asks'],
+                                                 'bids': book['bids']}
+
+
+def test_depth():
+
+    assert read_order_book(chunked(book), depth=1) == {'asks': book['asks'][:1],
+                                                       'bids': book['bids'][:1]}
+
+
+def test_notional():
+
+    r = read_order_book(chunked(book), notional=0.08)
+
+    assert len(r['asks']) == 2
+    assert len(r['bids']) == 2
+
+
+def test_stops_reading():
+    '''body is not read any further once the book is complete'''
+
+    deep = {'asks': [[str(i), 1] for i in range(1000)],
+            'bids': [[str(i), 1] for i in range(1000)]}
+    body = list(chunked({'bids': deep['bids'], 'asks': deep['asks']}, 100))
+    read = []
+
+    def chunks():
+        for i in body:
+            read.append(i)
+            yield i
+
+    r = read_order_book(chunks(), depth=10)
+
+    assert len(r['bids']) == 10 and len(r['asks']) == 10
+    assert len(read) < len(body)
+
+
+def test_nested():
+    '''kraken nests the book under result and pair name'''
+
+    kraken = {'error': [], 'result': {'XXBTZEUR': {'asks': [['7000.1', '1.2', 1530000000]],
+                                                   'bids': [['6999.9', '0.5', 1530000000]]}}}
+
+    assert read_order_book(chunked(kraken))['bids'] == [['6999.9', '0.5', 1530000000]]
+
+
+def test_error():
+    '''error responses are returned as they are'''
+
+    error = {'error': 'Invalid currency pair.'}
+
+    assert read_order_book(chunked(error)) == error
+
+
+def test_error_decoder():
+    '''error responses go through the decoder plugged in with set_decoder'''
+
+    from cryptotik.common import set_decoder, json_loads
+
+    calls = []
+
+    def loads(body):
+        calls.append(body)
+        return json.loads(body)
+
+    set_decoder(loads)
+    try:
+        read_order_book(chunked({'error': 'Invalid currency pair.'}))
+    finally:
+        set_decoder(json_loads)
+
+    assert len(calls) == 1
+
+
+def test_kraken_empty_book(exchange):
+    '''book without levels is unwrapped like any other kraken book'''
+
+    from cryptotik import KrakenNormalized
+
+    kraken = exchange(KrakenNormalized, {'error': [], 'result': {'XXBTZEUR': {'asks': [], 'bids': []}}})
+
+    assert kraken.get_market_orders('xbt-eur', stream=True) == {'bids': [], 'asks': []}
+    assert kraken.get_market_depth('xbt-eur') == {'bids': 0, 'asks': 0}
+
+
+def test_kraken_streamed_book(exchange):
+
+    from cryptotik import KrakenNormalized
+
+    kraken = exchange(KrakenNormalized, {'error': [], 'result': {'XXBTZEUR': {
+        'asks': [['7000.1', '1.2', 1530000000]], 'bids': [['6999.9', '0.5', 1530000000]]}}})
+
+    assert kraken.get_market_orders('xbt-eur', stream=True) == {'bids': [['6999.9', '0.5']],
+                                                                'asks': [['7000.1', '1.2']]}
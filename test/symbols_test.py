@@ -0,0 +1,87 @@
+import pytest
+from cryptotik import Kraken, KrakenNormalized, PoloniexNormalized
+
+
+@pytest.fixture
+def kraken(exchange):
+    '''KrakenNormalized listing eth-xbt and xbt-eur, it's symbol index emptied afterwards'''
+
+    def answer(method, url, kwargs):
+        return {'error': [], 'result': {
+            'Assets': {'XXBT': {'altname': 'XBT'}, 'XETH': {'altname': 'ETH'},
+                       'ZEUR': {'altname': 'EUR'}},
+            'AssetPairs': {'XETHXXBT': {'altname': 'ETHXBT', 'wsname': 'ETH/XBT',
+                                        'base': 'XETH', 'quote': 'XXBT'},
+                           'XETHXXBT.d': {'altname': 'ETHXBT.d', 'base': 'XETH', 'quote': 'XXBT'},
+                           'XXBTZEUR': {'altname': 'XBTEUR', 'wsname': 'XBT/EUR',
+                                        'base': 'XXBT', 'quote': 'ZEUR'}}
+        }[url.rsplit('/', 1)[1]]}
+
+    yield exchange(KrakenNormalized, answer)
+    KrakenNormalized.symbol_index().load([])
+
+
+def test_index_from_markets(kraken):
+    '''index is filled from the market list, keys are normalized lowercase pairs'''
+
+    kraken.load_symbols()
+
+    assert kraken.symbol_index().native == {'eth-xbt': 'ETHXBT', 'xbt-eur': 'XBTEUR'}
+    assert KrakenNormalized.format_pair('XBT-EUR') == 'XBTEUR'
+    assert kraken.reverse_format_pair('XBTEUR') == 'xbt-eur'
+    assert Kraken.symbol_index().native == {}  # classes have separate indexes
+
+
+def test_order_independent(kraken):
+    '''formatting pairs before the market list is loaded does not change the index'''
+
+    assert KrakenNormalized.format_pair('ETH-BTC') == 'ETHXBT'
+    assert KrakenNormalized.symbol_index().native == {}
+
+    assert kraken.reverse_format_pair('ETHXBT') == 'eth-xbt'  # loads the market list
+    assert KrakenNormalized.format_pair('eth-btc') == 'ETHXBT'
+
+    with pytest.raises(KeyError):
+        kraken.reverse_format_pair('XDGXBT')
+
+
+def test_kraken_asset_names(kraken):
+    '''markets use asset altnames, dark pool pairs are left out'''
+
+    assert kraken.get_markets() == ['eth-xbt', 'xbt-eur']
+    assert kraken.asset_index.get()['XXBT'] == 'XBT'
+    assert kraken.pair_index.get()['altnames']['XBTEUR'] == 'XXBTZEUR'
+
+
+def test_kraken_balances(exchange):
+    '''balance names need Assets only, AssetPairs are not downloaded'''
+
+    def answer(method, url, kwargs):
+        endpoint = url.rsplit('/', 1)[1]
+        if endpoint == 'AssetPairs':
+            raise AssertionError('AssetPairs downloaded')
+        if endpoint == 'Assets':
+            return {'error': [], 'result': {'XXBT': {'altname': 'XBT'}}}
+        return {'error': [], 'result': {'XXBT': '0.5', 'KFEE': '10'}}
+
+    kraken = exchange(KrakenNormalized, answer, 'key', 'c2VjcmV0')
+
+    assert kraken.get_balances() == {'XBT': '0.5', 'KFEE': '10'}
+
+
+def test_poloniex_margin_positions(exchange):
+    '''margin position keys are normalized pairs'''
+
+    def answer(method, url, kwargs):
+        if method == 'GET':
+            return {'BTC_ETH': {'last': '0.03'}}
+        return {'BTC_ETH': {'amount': '1', 'basePrice': '0.03', 'lendingFees': '0',
+                            'liquidationPrice': '0.01', 'pl': '0', 'total': '0.03',
+                            'type': 'long'}}
+
+    polo = exchange(PoloniexNormalized, answer, 'key', 'secret')
+
+    try:
+        assert list(polo.get_margin_position()) == ['eth-btc']
+    finally:
+        PoloniexNormalized.symbol_index().load([])
@@ -0,0 +1,28 @@
+import math
+from cryptotik import BinanceNormalized, HitbtcNormalized
+
+
+def test_binance_tickers(exchange):
+    '''tickers of the requested markets out of the all markets response'''
+
+    binance = exchange(BinanceNormalized,
+                       [{'symbol': s, 'askPrice': '2', 'bidPrice': '1', 'lastPrice': '1.5'}
+                        for s in ('ETHBTC', 'LTCBTC', 'BNBUSDT')])
+
+    tickers = binance.get_market_tickers(['eth-btc', 'bnb-usdt', 'xyz-btc'])
+
+    assert tickers == {'eth-btc': {'ask': 2.0, 'bid': 1.0, 'last': 1.5},
+                       'bnb-usdt': {'ask': 2.0, 'bid': 1.0, 'last': 1.5}}
+
+
+def test_hitbtc_markets_without_orders(exchange):
+    '''null prices of markets without orders do not fail the bulk call'''
+
+    hit = exchange(HitbtcNormalized,
+                   [{'symbol': 'ETHBTC', 'ask': '0.031', 'bid': '0.030', 'last': '0.0305'},
+                    {'symbol': 'XYZBTC', 'ask': None, 'bid': None, 'last': None}])
+
+    tickers = hit.get_market_tickers(['eth-btc', 'xyz-btc'])
+
+    assert tickers['eth-btc'] == {'ask': 0.031, 'bid': 0.030, 'last': 0.0305}
+    assert all(math.isnan(i) for i in tickers['xyz-btc'].values())